@@ -1,38 +1,14 @@
-import heapq
+import bisect
 import math
-from typing import List, Tuple, Dict, Optional
+import operator
+import sys
+from typing import List, Tuple, Optional, Sequence
 
+import colon_assignment
+import search_core
+import transposition_table
 
-class State:
-    def __init__(self,
-                 times: List[float],
-                 tasks_done: List[bool],
-                 g: float,
-                 f: float,
-                 ship_prev_colons: Optional[List[int]] = None,
-                 task_boarding_times: Optional[List[Optional[float]]] = None,
-                 previous=None,
-                 action=None):
-        self.times = times
-        self.tasks_done = tasks_done
-        self.g = g
-        self.f = f
-        if ship_prev_colons is None:
-            self.ship_prev_colons = [-1] * len(times)
-        else:
-            self.ship_prev_colons = ship_prev_colons
-        if task_boarding_times is None:
-            self.task_boarding_times = [None] * len(tasks_done)
-        else:
-            self.task_boarding_times = task_boarding_times
-        self.previous = previous
-        self.action = action
-
-    def __lt__(self, other):
-        return self.f < other.f
-
-    def __repr__(self):
-        return f"State(g={self.g:.1f}, f={self.f:.1f}, times={self.times}, prev={self.ship_prev_colons})"
+State = search_core.State
 
 
 def get_input():
@@ -47,43 +23,130 @@ def get_input():
     return num_ships, num_bases, num_colons, groups, capacities, to_base, deadLine, travel_matrix
 
 
-class Scheduler:
+HEURISTIC_MODES = search_core.HEURISTIC_MODES
+SEARCH_ENGINES = search_core.SEARCH_ENGINES
+
+
+class Scheduler(search_core.SchedulerBase):
+    builtin_pruners = (search_core.DeadlinePruner(),)
+
     def __init__(self,
                  num_ships: int,
                  base_to_colon: List[Tuple[int, int, int]],
                  texas_to_base: List[int],
                  deadLine: List[int],
-                 matrix_time: List[List[int]]):
-        self.num_ships = num_ships
-        self.jobs = base_to_colon
-        self.setup = texas_to_base
+                 matrix_time: List[List[int]],
+                 heuristic_mode: str = "basic",
+                 partial_order: bool = True,
+                 table_bytes: int = transposition_table.DEFAULT_MAX_BYTES,
+                 ship_times: Optional[Sequence[float]] = None,
+                 ship_colons: Optional[Sequence[int]] = None,
+                 vectorized: bool = False,
+                 pruners: Sequence[search_core.Pruner] = ()):
+        # the deadline checks run before any extra stages; prune_child is None
+        # when none is active (e.g. every deadline is -1)
         self.deadline = deadLine
-        self.matrix_time = matrix_time
-        self.num_tasks = len(self.jobs)
         self.num_bases = len(matrix_time)
-        self.min_service = []
-        for (b, c, travel) in self.jobs:
-            min_return = min(self.matrix_time[b])
-            self.min_service.append(travel + min(self.setup[b], min_return))
-
-    def heuristic(self, tasks_done: List[bool], times: List[float]) -> float:
-        rem = [self.min_service[i] for i, done in enumerate(tasks_done) if not done]
-        if not rem:
-            return 0.0
-        total_remaining = sum(rem)
-        m = self.num_ships
-        LB_final = max(max(times), math.ceil((sum(times) + total_remaining) / m))
-        return max(0.0, LB_final - max(times))
-
-    def greedy_initial_solution(self) -> float:
-        times = [0.0] * self.num_ships
-        prev = [-1] * self.num_ships
+        super().__init__(num_ships, base_to_colon, texas_to_base, matrix_time, heuristic_mode, partial_order,
+                         table_bytes, ship_times, ship_colons, vectorized, pruners)
+        # what a dominance list and each (g, ship times, boarding times) entry
+        # in it hold, reported to the closed-set table so its cap covers them
+        num_deadlines = len(self.deadline_bases)
+        self.dominance_list_bytes = sys.getsizeof([])
+        self.dominance_entry_bytes = (8 + sys.getsizeof((0, 0, 0)) + sys.getsizeof((0.0,) * num_ships)
+                                      + sys.getsizeof((0.0,) * num_deadlines)
+                                      + sys.getsizeof(0.0) * (1 + num_ships + num_deadlines))
+
+    def _build_zobrist_tables(self):
+        # random 64-bit keys per (job class, done count) and per (closed flag,
+        # previous colon); slot 0 of a ship table is the start, colon -1.
+        num_colons = len(self.matrix_time[0]) if self.matrix_time else 0
+        keys = transposition_table.zobrist_keys(
+            [len(tids) + 1 for tids in self.class_tasks] + [num_colons + 1] * 2)
+        self.class_zobrist = keys[:self.num_classes]
+        self.ship_zobrist = keys[self.num_classes:]
+
+    def _build_pruner_tables(self):
+        # the tables DeadlinePruner reads, starting with the bases that have a deadline
+        self.deadline_bases = [b for b in range(self.num_bases) if self.deadline[b] != -1]
+        # per base: its job classes, and the least time from a ship's start or
+        # colon to boarding there
+        self.base_class_order: List[List[int]] = [[] for _ in range(self.num_bases)]
+        for k in range(self.num_classes):
+            self.base_class_order[self.job_classes[k][0]].append(k)
+        self.base_approach = [min(self.setup[b], min(self.matrix_time[b])) for b in range(self.num_bases)]
+        # earliest-deadline-first windows: per distinct deadline d, the bases
+        # due by d, the work of all their tasks and (class, size, min_service,
+        # travel) of their job classes, longest travel first
+        self.deadline_windows: List[Tuple[float, List[int], float, List[Tuple[int, int, float, float]]]] = []
+        for dl in sorted({self.deadline[b] for b in self.deadline_bases}):
+            bases = [b for b in self.deadline_bases if self.deadline[b] <= dl]
+            classes = [(k, len(self.class_tasks[k]), self.class_min_service[k], self.job_classes[k][2])
+                       for k in range(self.num_classes) if self.job_classes[k][0] in bases]
+            classes.sort(key=lambda c: -c[3])
+            if classes:
+                self.deadline_windows.append((dl, bases, sum(c[1] * c[2] for c in classes), classes))
+
+    def violates_deadlines(self, counts: List[int], served: int, sorted_times: List[float],
+                           base_boarding: Tuple[float, ...]) -> bool:
+        # counts are the parent's done counts and served the class just assigned.
+        # Only lower bounds are checked, so no schedule that meets the deadlines
+        # is cut: a base fails once it has boarded late, or when it has tasks
+        # left that even the earliest open ship cannot board in time. The
+        # windows then bound the work of all bases due by each deadline.
+        earliest = sorted_times[0]
+        for b in self.deadline_bases:
+            dl = self.deadline[b]
+            if base_boarding[b] > dl:
+                return True
+            if earliest + self.base_approach[b] > dl and any(
+                    len(self.class_tasks[k]) - counts[k] - (k == served) for k in self.base_class_order[b]):
+                return True
+        return self.overloaded_window(counts, served, sorted_times) is not None
+
+    def overloaded_window(self, counts: List[int], served: int,
+                          sorted_times: List[float]) -> Optional[Tuple[float, List[int], float, float]]:
+        # The per-base check lets each base have the whole fleet. Across bases,
+        # every remaining task of the bases due by d must board by d: a ship
+        # free at t spends at most d - t on them before d, its last such task
+        # only up to boarding, the others whole. So the work due by d, less
+        # the longest travel of one task per ship that can still make it,
+        # must fit in the ships' summed time left before d. Returns the first
+        # (d, bases, work, capacity) that does not fit, or None.
+        for dl, bases, all_work, classes in self.deadline_windows:
+            ships = bisect.bisect_right(sorted_times, dl)
+            capacity = ships * dl - sum(sorted_times[:ships])
+            if capacity >= all_work:
+                continue
+            work = 0.0
+            last_legs = ships
+            for k, size, serv, travel in classes:
+                left = size - counts[k] - (k == served)
+                if not left:
+                    continue
+                if last_legs:
+                    legs = left if left < last_legs else last_legs
+                    work += left * serv - legs * travel
+                    last_legs -= legs
+                else:
+                    work += left * serv
+            if work > capacity:
+                return dl, bases, work, capacity
+        return None
+
+    def greedy_initial_schedule(self) -> Tuple[float, List[Tuple[int, int]]]:
+        times = list(self.start_times)
+        prev = list(self.start_colons)
         boarding_times = [None] * self.num_tasks
+        actions: List[Tuple[int, int]] = []
         base_dead = {b: (self.deadline[b] if b < len(self.deadline) else -1) for b in range(self.num_bases)}
         order = list(range(self.num_tasks))
         order.sort(key=lambda tid: (base_dead[self.jobs[tid][0]] if base_dead[self.jobs[tid][0]] != -1 else 1e9,
                                     -self.min_service[tid]))
 
+        # the whole schedule is built even past a missed deadline so that local
+        # search can try to repair it; the makespan is inf in that case.
+        late = False
         for tid in order:
             sh = min(range(self.num_ships), key=lambda s: times[s])
             b, c, travel = self.jobs[tid]
@@ -95,186 +158,117 @@ class Scheduler:
             times[sh] = arrival
             prev[sh] = c
             boarding_times[tid] = boarding
+            actions.append((sh, tid))
             dl = self.deadline[b] if b < len(self.deadline) else -1
             if dl != -1 and boarding > dl:
-                return math.inf
-
-        return max(times)
+                late = True
+
+        return (math.inf if late else max(times)), actions
+
+    def evaluate_routes(self, routes: List[List[int]]) -> Tuple[float, List[float]]:
+        # (total boarding lateness over deadline bases, finish time per ship)
+        lateness = 0.0
+        finish = []
+        for route, t, prev in zip(routes, self.start_times, self.start_colons):
+            for tid in route:
+                b, c, travel = self.jobs[tid]
+                t += self.setup[b] if prev == -1 else self.matrix_time[b][prev]
+                dl = self.deadline[b]
+                if dl != -1 and t > dl:
+                    lateness += t - dl
+                t += travel
+                prev = c
+            finish.append(t)
+        return lateness, finish
+
+    def restarted(self, jobs: List[Tuple[int, int, int]], ship_times: Sequence[float],
+                  ship_colons: Sequence[int]) -> "Scheduler":
+        # a scheduler with these settings over other tasks and ship start state
+        return Scheduler(self.num_ships, jobs, self.setup, self.deadline, self.matrix_time,
+                         self.heuristic_mode, self.partial_order, self.table_bytes,
+                         ship_times, ship_colons, self.vectorized, self.pruners)
 
     def check_deadlines_feasible_initial(self) -> Tuple[bool, str]:
-        base_services: Dict[int, List[float]] = {b: [] for b in range(self.num_bases)}
-        for tid, (b, c, travel) in enumerate(self.jobs):
-            base_services[b].append(self.min_service[tid])
-        for b, dl in enumerate(self.deadline):
-            if dl == -1:
-                continue
-            services = base_services.get(b, [])
-            if not services:
-                continue
-            if min(services) > dl:
-                return False, f"Base {b}: single cheapest service {min(services)} > deadline {dl}"
-            est = [0.0] * self.num_ships
-            for serv in sorted(services, reverse=True):
-                i = est.index(min(est))
-                est[i] += serv
-            if max(est) > dl:
-                return False, f"Base {b}: even optimistic all-ships dedicated makespan {max(est)} > deadline {dl}"
+        earliest = min(self.start_times)
+        for b in self.deadline_bases:
+            dl = self.deadline[b]
+            if self.base_class_order[b] and earliest + self.base_approach[b] > dl:
+                return False, (f"Base {b}: earliest possible boarding {earliest + self.base_approach[b]} "
+                               f"> deadline {dl}")
+        window = self.overloaded_window([0] * self.num_classes, -1, sorted(self.start_times))
+        if window is not None:
+            dl, bases, work, capacity = window
+            return False, (f"Bases {bases}: work due by deadline {dl} is at least {work}, "
+                           f"more than the {capacity} the ships have left")
         return True, ""
 
-    def canonical_key(self, tasks_done: List[bool], times: List[float], prev_cols: List[int],
-                      task_boarding_times: List[Optional[float]]) -> Tuple:
-
-        pairs = tuple(sorted(zip(times, prev_cols)))
-        return (tuple(tasks_done), pairs, tuple(task_boarding_times))
-
-    def search(self) -> Optional[State]:
-        init_times = [0.0] * self.num_ships
-        init_tasks_done = [False] * self.num_tasks
-        init_ship_prev = [-1] * self.num_ships
-        init_task_boarding = [None] * self.num_tasks
-        init_h = self.heuristic(init_tasks_done, init_times)
-        init_state = State(times=init_times, tasks_done=init_tasks_done, g=0.0, f=init_h,
-                           ship_prev_colons=init_ship_prev, task_boarding_times=init_task_boarding)
-
-        ok, msg = self.check_deadlines_feasible_initial()
-        if not ok:
-            print("Initial feasibility check failed:", msg)
-            return None
-
-        incumbent = self.greedy_initial_solution()
-        heap: List[State] = []
-        heapq.heappush(heap, init_state)
-        watched: Dict[Tuple, float] = {}
-
-        while heap:
-            cur = heapq.heappop(heap)
-            if all(cur.tasks_done):
-                if cur.g < incumbent:
-                    incumbent = cur.g
-                return cur
-
-            if incumbent != math.inf and cur.g > incumbent:
-                continue
-
-            key = self.canonical_key(cur.tasks_done, cur.times, cur.ship_prev_colons, cur.task_boarding_times)
-            if key in watched and watched[key] <= cur.g:
-                continue
-            watched[key] = cur.g
-
-            for tsk_id in range(self.num_tasks):
-                if cur.tasks_done[tsk_id]:
-                    continue
-                base, colon, travel = self.jobs[tsk_id]
-                for sh in range(self.num_ships):
-                    new_times = cur.times.copy()
-                    new_tasks_done = cur.tasks_done.copy()
-                    new_tasks_done[tsk_id] = True
-                    new_prev = cur.ship_prev_colons.copy()
-                    new_task_boarding = cur.task_boarding_times.copy()
-                    start = cur.times[sh]
-                    prev_col = new_prev[sh]
-                    if prev_col == -1:
-                        boarding_time = start + self.setup[base]
-                        arrival_time = boarding_time + travel
-                    else:
-                        boarding_time = start + self.matrix_time[base][prev_col]
-                        arrival_time = boarding_time + travel
-
-                    new_times[sh] = arrival_time
-                    new_prev[sh] = colon
-                    new_task_boarding[tsk_id] = boarding_time
-
-                    new_g = max(cur.g, new_times[sh])
-                    h = self.heuristic(new_tasks_done, new_times)
-
-                    cur_boarding_per_base = {b: 0.0 for b in range(self.num_bases)}
-                    for tidx, bt in enumerate(new_task_boarding):
-                        if bt is not None:
-                            bidx, _, _ = self.jobs[tidx]
-                            if bt > cur_boarding_per_base[bidx]:
-                                cur_boarding_per_base[bidx] = bt
-
-                    remaining_min_services = {b: [] for b in range(self.num_bases)}
-                    for tidx, done in enumerate(new_tasks_done):
-                        if not done:
-                            bidx, _, trav = self.jobs[tidx]
-                            min_return = min(self.matrix_time[bidx])
-                            min_serv = trav + min(self.setup[bidx], min_return)
-                            remaining_min_services[bidx].append(min_serv)
-
-                    violates = False
-                    for b in range(self.num_bases):
-                        dl = self.deadline[b]
-                        if dl == -1:
-                            continue
-                        cur_boarding = cur_boarding_per_base[b]
-                        rem = remaining_min_services[b]
-                        if not rem:
-                            if cur_boarding > dl:
-                                violates = True
-                                break
-                            else:
-                                continue
-                        est_ships = sorted(new_times)
-                        boarding_times_for_b = []
-                        for serv in sorted(rem, reverse=True):
-                            earliest = est_ships[0]
-                            boarding_times_for_b.append(earliest)
-                            est_ships[0] += serv
-                            est_ships.sort()
-                        optimistic_boarding_completion = max(cur_boarding, max(boarding_times_for_b))
-                        if optimistic_boarding_completion > dl:
-                            violates = True
-                            break
-
-                    if violates:
-                        continue
-
-                    if incumbent != math.inf and new_g + h > incumbent:
-                        continue
-
-                    new_state = State(times=new_times, tasks_done=new_tasks_done,
-                                      g=new_g, f=new_g + h,
-                                      ship_prev_colons=new_prev,
-                                      task_boarding_times=new_task_boarding,
-                                      previous=cur, action=(sh, tsk_id))
-                    heapq.heappush(heap, new_state)
-
-        return None
-
-    def reconstruct(self, end_state: State) -> List[Tuple[int, int]]:
-        path: List[Tuple[int, int]] = []
-        s = end_state
-        while s.previous is not None:
-            path.append(s.action)
-            s = s.previous
-        return list(reversed(path))
-
-    def print_schedule_with_stages(self, end_state: State):
-        schedule = self.reconstruct(end_state)
-        base_to_colon = self.jobs
-        cur_times = [0.0] * self.num_ships
-        prev_col = [-1] * self.num_ships
-        detailed = []
-
-        for (ship_idx, task_id) in schedule:
-            base_idx, colon_idx, travel = base_to_colon[task_id]
-            if prev_col[ship_idx] == -1:
-                service = self.setup[base_idx] + travel
-            else:
-                service = self.matrix_time[base_idx][prev_col[ship_idx]] + travel
-            start = cur_times[ship_idx]
-            end = start + service
-            cur_times[ship_idx] = end
-            prev_col[ship_idx] = colon_idx
-            detailed.append((ship_idx, task_id, base_idx, colon_idx, service, start, end))
-
-        detailed.sort(key=lambda x: x[5])
-        for step, detail in enumerate(detailed):
-            ship_idx, task_id, base_idx, colon_idx, service, start, end = detail
-            print(
-                f"step: {step}, ship_idx: {ship_idx}, base_idx: {base_idx}, colon_idx: {colon_idx}, start: {start}, end: {end}"
-            )
+    def canonical_key(self, tasks_done: int, times: Tuple[float, ...],
+                      prev_cols: Tuple[int, ...], closed_ships: int = 0) -> Tuple[Tuple, Tuple[float, ...]]:
+        # ships sorted by (colon, time): the key holds the done counts and the
+        # colon multiset, the second item the ship times aligned with it. Closed
+        # ships are keyed by (1, colon) so they only line up with closed ships.
+        if closed_ships:
+            prev_cols = tuple((closed_ships >> sh & 1, c) for sh, c in enumerate(prev_cols))
+        pairs = sorted(zip(prev_cols, times))
+        return (tasks_done, tuple(c for c, _ in pairs)), tuple(t for _, t in pairs)
+
+    def closed_key(self, state: State) -> Tuple:
+        return self.canonical_key(state.tasks_done, state.times, state.ship_prev_colons,
+                                  state.closed_ships)[0]
+
+    def ship_hash(self, time: float, prev_col: int, closed: int) -> int:
+        # dominance compares ship times, so a ship's key covers only its colon
+        return self.ship_zobrist[closed][prev_col + 1]
+
+    def is_dominated(self, closed: transposition_table.TranspositionTable, state: State) -> bool:
+        # A closed state with the same served tasks and ship colons dominates
+        # `state` if it is no later on g, on every ship time and on every
+        # deadline base's boarding time: whatever `state` can still do, it can
+        # do at least as early. Otherwise `state` is recorded and the entries
+        # it dominates are dropped.
+        ship_times = self.canonical_key(state.tasks_done, state.times, state.ship_prev_colons,
+                                        state.closed_ships)[1]
+        boarding = tuple(state.base_boarding[b] for b in self.deadline_bases)
+        key = self.key_hash(state)
+        entries = closed.get(key)
+        if entries is None:
+            entries = [(state.g, ship_times, boarding)]
+        else:
+            for g, e_times, e_boarding in entries:
+                if (g <= state.g and all(map(operator.le, e_times, ship_times))
+                        and all(map(operator.le, e_boarding, boarding))):
+                    return True
+            entries[:] = [e for e in entries
+                          if not (state.g <= e[0] and all(map(operator.le, ship_times, e[1]))
+                                  and all(map(operator.le, boarding, e[2])))]
+            entries.append((state.g, ship_times, boarding))
+        closed.put(key, entries, self.dominance_list_bytes + len(entries) * self.dominance_entry_bytes)
+        return False
+
+    def initial_boarding(self) -> Tuple[float, ...]:
+        return (0.0,) * self.num_bases
+
+    def boarded(self, base_boarding: Tuple[float, ...], base: int, boarding_time: float) -> Tuple[float, ...]:
+        if boarding_time > base_boarding[base]:
+            return base_boarding[:base] + (boarding_time,) + base_boarding[base + 1:]
+        return base_boarding
+
+    def finished(self, state: Optional[State]) -> Optional[State]:
+        # Search states do not carry per-task boarding times, which would cost a
+        # tuple of num_tasks per open state. The states handed back to callers
+        # get them from their node-log path instead.
+        if state is None or state.task_boarding_times:
+            return state
+        boarding: List[Optional[float]] = [None] * self.num_tasks
+        times = list(self.start_times)
+        prev = list(self.start_colons)
+        for sh, tid in self.reconstruct(state):
+            b, c, travel = self.jobs[tid]
+            boarding[tid] = times[sh] + (self.setup[b] if prev[sh] == -1 else self.matrix_time[b][prev[sh]])
+            times[sh] = boarding[tid] + travel
+            prev[sh] = c
+        state.task_boarding_times = tuple(boarding)
+        return state
 
 
 def give_best_colon_for_base(capacities, num_colons, b, travel_matrix):
@@ -290,13 +284,7 @@ if __name__ == '__main__':
         3, 3, 3, [1, 3, 3], [4, 4, 1], [7, 4, 9], [-1, -1, 10], [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
     )
 
-    tasks: List[Tuple[int, int, int]] = []
-    caps = capacities.copy()
-    for b in range(num_bases):
-        for _ in range(base[b]):
-            best_colon = give_best_colon_for_base(caps, num_colons, b, travel_matrix)
-            tasks.append((b, best_colon, travel_matrix[b][best_colon]))
-            caps[best_colon] -= 1
+    tasks = colon_assignment.assign_tasks(base, capacities, travel_matrix)
 
     scheduler = Scheduler(num_ships, tasks, to_base, deadLine, travel_matrix)
     end_state = scheduler.search()
@@ -1,65 +1,33 @@
-import heapq
-import math
-from typing import List, Tuple, Dict
-
-
-class State:
-    def __init__(self,
-                 times: List[float],
-                 tasks_done: List[bool],
-                 g: float,
-                 f: float,
-                 ship_previous_colons: List[int] = None,
-                 previous=None,
-                 action=None):
-        self.times = times
-        self.tasks_done = tasks_done
-        self.g = g
-        self.f = f
-        if ship_previous_colons is None:
-            self.ship_previous_colons = [-1] * len(times)
-        else:
-            self.ship_previous_colons = ship_previous_colons
-        self.previous = previous
-        self.action = action
-
-    def __lt__(self, other):
-        return self.f < other.f
+from typing import List, Sequence, Tuple
+
+import colon_assignment
+import search_core
+
+
+class State(search_core.State):
+    __slots__ = ()
+
+    @property
+    def ship_previous_colons(self) -> Tuple[int, ...]:
+        return self.ship_prev_colons
 
     def __str__(self):
         return (str(self.times) + '\n'
-                + str(self.tasks_done) + '\n' + str(self.g) + ' ' + str(self.f) + '\n' +
-                str(self.ship_previous_colons) + '\n' + str(self.previous) + '\n')
-
-class Scheduler:
-    def __init__(self,
-                 num_ships: int,
-                 base_to_colon: List[Tuple[int, int, float]],
-                 texas_to_base: List[float],
-                 matrix_time: List[List[int]]):
-        self.num_ships = num_ships
-        self.jobs = base_to_colon
-        self.setup = texas_to_base
-        self.num_tasks = len(self.jobs)
-        self.matrix_time = matrix_time
-
-        self.min_service = []
-        for (b, c, travel) in self.jobs:
-            min_return = min(self.matrix_time[b])
-            self.min_service.append(min(self.setup[b], min_return) + travel)
-
-    def heuristic(self, tasks_done: List[bool], times: List[float]) -> float:
-        rem = [self.min_service[i] for i, done in enumerate(tasks_done) if not done]
-        if not rem:
-            return 0.0
-        total_remaining = sum(rem)
-        m = self.num_ships
-        LB_final = max(max(times), math.ceil((sum(times) + total_remaining) / m))
-        return max(0.0, LB_final - max(times))
-
-    def greedy_initial_solution(self):
-        times = [0.0] * self.num_ships
-        prev = [-1] * self.num_ships
+                + bin(self.tasks_done) + '\n' + str(self.g) + ' ' + str(self.f) + '\n' +
+                str(self.ship_previous_colons) + '\n' + str(self.parent) + '\n')
+
+
+HEURISTIC_MODES = search_core.HEURISTIC_MODES
+SEARCH_ENGINES = search_core.SEARCH_ENGINES
+
+
+class Scheduler(search_core.SchedulerBase):
+    state_class = State
+
+    def greedy_initial_schedule(self) -> Tuple[float, List[Tuple[int, int]]]:
+        times = list(self.start_times)
+        prev = list(self.start_colons)
+        actions: List[Tuple[int, int]] = []
         tasks_left = list(range(self.num_tasks))
         rem_order = sorted(tasks_left, key=lambda i: self.min_service[i], reverse=True)
         for tid in rem_order:
@@ -71,105 +39,26 @@ class Scheduler:
                 added = self.matrix_time[b][prev[sh]] + travel
             times[sh] += added
             prev[sh] = c
-        return max(times)
-
-    def canonical_key(self, tasks_done, times, prev_cols):
-        pairs = tuple(sorted(zip(times, prev_cols)))
-        return (tuple(tasks_done), pairs)
-
-    def search(self):
-        init_times = [0.0] * self.num_ships
-        init_tasks_done = [False] * self.num_tasks
-        init_prev = [-1] * self.num_ships
-        init_h = self.heuristic(init_tasks_done, init_times)
-        init_state = State(times=init_times, tasks_done=init_tasks_done, g=0.0, f=init_h,
-                           ship_previous_colons=init_prev)
-
-        incumbent = self.greedy_initial_solution()
-
-        heap = []
-        heapq.heappush(heap, init_state)
-        watched: Dict[Tuple, float] = {}
-
-        while heap:
-            cur = heapq.heappop(heap)
-
-            if all(cur.tasks_done):
-                if cur.g < incumbent:
-                    incumbent = cur.g
-                return cur
-
-            if cur.g > incumbent:
-                continue
-
-            key = self.canonical_key(cur.tasks_done, cur.times, cur.ship_previous_colons)
-            if key in watched and watched[key] <= cur.g:
-                continue
-            watched[key] = cur.g
-
-            for tsk_id in range(self.num_tasks):
-                if cur.tasks_done[tsk_id]:
-                    continue
-                base, colon, travel = self.jobs[tsk_id]
-                for sh in range(self.num_ships):
-                    new_time = cur.times.copy()
-                    new_tasks_done = cur.tasks_done.copy()
-                    new_tasks_done[tsk_id] = True
-                    new_prev = cur.ship_previous_colons.copy()
-                    prev_colon = new_prev[sh]
-                    if prev_colon == -1:
-                        added = self.setup[base] + travel
-                    else:
-                        added = self.matrix_time[base][prev_colon] + travel
-
-                    new_time[sh] += added
-                    new_prev[sh] = colon
-                    new_g = max(cur.g, new_time[sh])
-                    h = self.heuristic(new_tasks_done, new_time)
-
-                    if new_g + h > incumbent:
-                        continue
-
-                    new_state = State(new_time, new_tasks_done, new_g, new_g + h,
-                                      ship_previous_colons=new_prev,
-                                      previous=cur, action=(sh, tsk_id))
-                    heapq.heappush(heap, new_state)
-
-        return None
-
-    def reconstruct(self, end_state: State) -> List[Tuple[int, int]]:
-        path = []
-        s = end_state
-        while s.previous is not None:
-            path.append(s.action)
-            s = s.previous
-        return list(reversed(path))
-
-    def print_schedule_with_stages(self, end_state: State):
-        schedule = self.reconstruct(end_state)
-        base_to_colon = self.jobs
-        current_times = [0.0] * self.num_ships
-        prev_col = [-1] * self.num_ships
-        detailed = []
-
-        for step, (ship_idx, task_id) in enumerate(schedule):
-            base_idx, colon_idx, travel = base_to_colon[task_id]
-            if prev_col[ship_idx] == -1:
-                service = self.setup[base_idx] + travel
-            else:
-                service = self.matrix_time[base_idx][prev_col[ship_idx]] + travel
-            start = current_times[ship_idx]
-            end = start + service
-            current_times[ship_idx] = end
-            prev_col[ship_idx] = colon_idx
-            detailed.append((ship_idx, task_id, base_idx, colon_idx, service, start, end))
-
-        detailed.sort(key=lambda x: x[5])
-        for step, detail in enumerate(detailed):
-            ship_idx, task_id, base_idx, colon_idx, service, start, end = detail
-            print(
-                f"step: {step}, ship_idx: {ship_idx}, base_idx: {base_idx}, colon_idx: {colon_idx}, start: {start}, end: {end}"
-            )
+            actions.append((sh, tid))
+        return max(times), actions
+
+    def evaluate_routes(self, routes: List[List[int]]) -> Tuple[float, List[float]]:
+        # (deadline lateness, always 0 here, finish time per ship)
+        finish = []
+        for route, t, prev in zip(routes, self.start_times, self.start_colons):
+            for tid in route:
+                b, c, travel = self.jobs[tid]
+                t += (self.setup[b] if prev == -1 else self.matrix_time[b][prev]) + travel
+                prev = c
+            finish.append(t)
+        return 0.0, finish
+
+    def restarted(self, jobs: List[Tuple[int, int, float]], ship_times: Sequence[float],
+                  ship_colons: Sequence[int]) -> "Scheduler":
+        # a scheduler with these settings over other tasks and ship start state
+        return Scheduler(self.num_ships, jobs, self.setup, self.matrix_time, self.heuristic_mode,
+                         self.partial_order, self.table_bytes, ship_times, ship_colons, self.vectorized,
+                         self.pruners)
 
 
 def give_best_colon_for_base(capacities, num_colons, b, travel_matrix):
@@ -182,13 +71,7 @@ def give_best_colon_for_base(capacities, num_colons, b, travel_matrix):
 if __name__ == '__main__':
     # num_ships, num_bases, num_colons, base, capacities, to_base, travel_matrix = get_input()
     num_ships, num_bases, num_colons, base, capacities, to_base, travel_matrix = ( 3, 3, 3, [1, 3, 3], [4, 4, 1], [7, 4, 9], [[6, 7, 8], [10, 9, 2], [6, 3, 7]])
-    tasks: List[Tuple[int, int, int]] = []
-    caps = capacities.copy()
-    for b in range(num_bases):
-        for _ in range(base[b]):
-            best_colon = give_best_colon_for_base(caps, num_colons, b, travel_matrix)
-            tasks.append((b, best_colon, travel_matrix[b][best_colon]))
-            caps[best_colon] -= 1
+    tasks = colon_assignment.assign_tasks(base, capacities, travel_matrix)
     base_to_colon = tasks
 
     scheduler = Scheduler(num_ships, base_to_colon, to_base, matrix_time=travel_matrix)
@@ -0,0 +1,70 @@
+import heapq
+import math
+from typing import Iterator, List, Optional, Tuple
+
+# weight on h used until each successive improvement; the last one must be 1.0
+DEFAULT_WEIGHTS = (3.0, 2.0, 1.5, 1.25, 1.0)
+
+
+def check_weights(weights: Tuple[float, ...]):
+    # the last pass must run plain A*, or the final schedule is not proven optimal
+    if not weights or weights[-1] != 1.0:
+        raise ValueError(f"anytime weights must end with 1.0, got {tuple(weights)}")
+
+
+def weighted_astar(scheduler, init_state, seed_actions: Optional[List[Tuple[int, int]]],
+                   weights: Tuple[float, ...] = DEFAULT_WEIGHTS) -> Iterator[Tuple[object, float]]:
+    """Anytime weighted A* with a decreasing weight (in the spirit of ARA*).
+
+    Open states are ordered by g + w * h, while pruning always uses the
+    admissible f = g + h against the best schedule found so far. Every time a
+    better schedule is found, w steps down to the next weight and the open
+    list is re-keyed; the closed set is kept because duplicate detection does
+    not depend on the weight. Yields (end_state, lower_bound) for the seed
+    schedule (if any) and each improvement, where lower_bound is the best
+    proven bound at that moment. When the open list runs dry the last
+    schedule is optimal and is yielded once more with lower_bound == g.
+    `weights` must end with 1.0 (see check_weights).
+    """
+    root_bound = init_state.f
+    best = None
+    best_g = math.inf
+    if seed_actions is not None:
+        best = scheduler.replay(seed_actions)
+        best_g = best.g
+        yield best, min(root_bound, best_g)
+
+    stage = 0
+    weight = weights[0]
+    heap = [(init_state.g + weight * (init_state.f - init_state.g), 0, init_state)]
+    tie = 1
+    closed = scheduler.new_closed_table()
+
+    while heap:
+        _, _, cur = heapq.heappop(heap)
+        if cur.f >= best_g:
+            continue
+
+        if cur.tasks_done == scheduler.all_done:
+            best, best_g = cur, cur.g
+            if stage < len(weights) - 1:
+                stage += 1
+                weight = weights[stage]
+            heap = [(s.g + weight * (s.f - s.g), t, s) for _, t, s in heap if s.f < best_g]
+            heapq.heapify(heap)
+            if heap:
+                open_bound = min(s.f for _, _, s in heap)
+                yield best, min(best_g, max(root_bound, open_bound))
+            continue
+
+        if scheduler.is_dominated(closed, cur):
+            continue
+
+        for child in scheduler.expand(cur, best_g):
+            if child.f >= best_g:
+                continue
+            heapq.heappush(heap, (child.g + weight * (child.f - child.g), tie, child))
+            tie += 1
+
+    if best is not None:
+        yield best, best.g
@@ -0,0 +1,247 @@
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import colon_assignment
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import solution_cache
+
+# seconds a single scenario may search before it is reported as a timeout
+DEFAULT_TIME_LIMIT = 60.0
+# scenarios submitted to the pool per worker before the oldest result is awaited
+IN_FLIGHT_PER_WORKER = 2
+
+
+class ScenarioTimeout(Exception):
+    pass
+
+
+def build_scheduler(scenario: Dict):
+    """Scheduler for one scenario dict.
+
+    Keys follow `get_input`: num_ships, groups, capacities, to_base and
+    travel_matrix (one row per base), plus optional deadlines (-1 = none),
+    which selects the deadline scheduler, heuristic_mode and assignment
+    (a `colon_assignment.ASSIGNMENT_MODES` entry).
+    """
+    travel_matrix = scenario["travel_matrix"]
+    num_bases = len(travel_matrix)
+    num_colons = len(scenario["capacities"])
+    groups = scenario["groups"]
+    to_base = scenario["to_base"]
+    if len(groups) != num_bases or len(to_base) != num_bases:
+        raise ValueError(f"groups and to_base need one entry per base ({num_bases})")
+    if any(len(row) != num_colons for row in travel_matrix):
+        raise ValueError(f"travel_matrix rows need one entry per colon ({num_colons})")
+    if scenario["num_ships"] < 1:
+        raise ValueError("num_ships must be at least 1")
+
+    tasks = colon_assignment.assign_tasks(groups, scenario["capacities"], travel_matrix,
+                                          scenario.get("assignment", "greedy"))
+    mode = scenario.get("heuristic_mode", "basic")
+    deadlines = scenario.get("deadlines")
+    if deadlines is not None:
+        if len(deadlines) != num_bases:
+            raise ValueError(f"deadlines needs one entry per base ({num_bases})")
+        return deadline.Scheduler(scenario["num_ships"], tasks, to_base, deadlines, travel_matrix,
+                                  heuristic_mode=mode)
+    return standard.Scheduler(scenario["num_ships"], tasks, to_base, matrix_time=travel_matrix,
+                              heuristic_mode=mode)
+
+
+@contextlib.contextmanager
+def time_limit(seconds: Optional[float]):
+    # SIGALRM interrupts the pure-Python search loop; without it (non-POSIX, or
+    # off the main thread) the scenario simply runs unbounded.
+    if (not seconds or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise ScenarioTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def solve_scenario(scenario: Union[str, Dict], index: int = 0,
+                   limit: Optional[float] = DEFAULT_TIME_LIMIT, cache_path: Optional[str] = None) -> Dict:
+    """Solve one scenario (a dict or a JSON line) and return a result record.
+
+    status is "ok", "infeasible", "timeout" or "error"; the record never
+    raises, so one bad scenario cannot stop a batch. Anything the schedulers
+    print is captured rather than mixed into the output stream. With a
+    cache_path, solutions are looked up in and stored to that
+    `solution_cache.SolutionCache` file, and the record says if it was a cache_hit.
+    """
+    start = time.perf_counter()
+    result: Dict = {"id": index}
+    try:
+        if isinstance(scenario, str):
+            scenario = json.loads(scenario)
+        if not isinstance(scenario, dict):
+            raise ValueError("scenario must be a JSON object")
+        result["id"] = scenario.get("id", index)
+        engine = scenario.get("engine", "astar")
+        with time_limit(limit), contextlib.redirect_stdout(io.StringIO()):
+            scheduler = build_scheduler(scenario)
+            if isinstance(scheduler, deadline.Scheduler):
+                ok, msg = scheduler.check_deadlines_feasible_initial()
+                if not ok:
+                    result.update(status="infeasible", reason=msg)
+                    return result
+            if cache_path is None:
+                end_state = scheduler.search(engine=engine)
+            else:
+                with solution_cache.SolutionCache(cache_path) as cache:
+                    end_state = cache.search(scheduler, engine=engine)
+                result["cache_hit"] = scheduler.cache_hit
+        if end_state is None:
+            result.update(status="infeasible", reason="no schedule meets the deadlines")
+        else:
+            result.update(status="ok", makespan=end_state.g,
+                          tasks=[list(job) for job in scheduler.jobs],
+                          schedule=[list(step) for step in scheduler.reconstruct(end_state)])
+    except ScenarioTimeout:
+        result.update(status="timeout", reason=f"no result within {limit} s")
+    except Exception as exc:
+        result.update(status="error", reason=f"{type(exc).__name__}: {exc}")
+    finally:
+        result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def _solve_job(job: Tuple[int, Union[str, Dict], Optional[float], Optional[str]]) -> Dict:
+    index, scenario, limit, cache_path = job
+    return solve_scenario(scenario, index, limit, cache_path)
+
+
+def _lost_job(job: Tuple[int, Union[str, Dict], Optional[float], Optional[str]]) -> Dict:
+    # record for a scenario whose worker process died while solving it
+    index, scenario = job[:2]
+    try:
+        if isinstance(scenario, str):
+            scenario = json.loads(scenario)
+        index = scenario.get("id", index)
+    except Exception:
+        pass
+    return {"id": index, "status": "error", "reason": "worker process died", "seconds": 0.0}
+
+
+def _new_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    return concurrent.futures.ProcessPoolExecutor(workers, mp_context=mp.get_context())
+
+
+def _submit(pool: concurrent.futures.ProcessPoolExecutor, job) -> concurrent.futures.Future:
+    # a pool that broke since the last result fails the job, for _next_result to re-run
+    try:
+        return pool.submit(_solve_job, job)
+    except BrokenProcessPool as exc:
+        future = concurrent.futures.Future()
+        future.set_exception(exc)
+        return future
+
+
+def _next_result(pending: Deque, pool: concurrent.futures.ProcessPoolExecutor,
+                 workers: int) -> Tuple[Dict, concurrent.futures.ProcessPoolExecutor]:
+    # Oldest result. A dead worker breaks the whole pool and fails every
+    # unfinished job, so those are re-run one at a time on a fresh pool: a
+    # second crash pins the scenario that caused it, which gets an error record.
+    job, future = pending[0]
+    try:
+        result = future.result()
+    except BrokenProcessPool:
+        pool.shutdown(wait=False)
+        pool = _new_pool(workers)
+        for i, (job, future) in enumerate(pending):
+            if future.exception() is None:
+                continue
+            rerun = concurrent.futures.Future()
+            try:
+                rerun.set_result(pool.submit(_solve_job, job).result())
+            except BrokenProcessPool:
+                pool.shutdown(wait=False)
+                pool = _new_pool(workers)
+                rerun.set_result(_lost_job(job))
+            pending[i] = (job, rerun)
+        result = pending[0][1].result()
+    pending.popleft()
+    return result, pool
+
+
+def solve_batch(scenarios: Iterable[Union[str, Dict]], workers: Optional[int] = None,
+                limit: Optional[float] = DEFAULT_TIME_LIMIT, cache_path: Optional[str] = None) -> Iterator[Dict]:
+    """Solve scenarios across a process pool, yielding results in input order.
+
+    Scenarios are consumed lazily: at most IN_FLIGHT_PER_WORKER per worker
+    are read ahead of the result being yielded, so a JSONL stream of any
+    length is processed with bounded memory; blank lines are skipped.
+    A scenario whose worker dies (killed, out of memory) yields an "error"
+    record and the pool is rebuilt for the rest. workers=1 solves in-process.
+    """
+    jobs = ((i, s, limit, cache_path) for i, s in enumerate(scenarios)
+            if not (isinstance(s, str) and not s.strip()))
+    if workers == 1:
+        yield from map(_solve_job, jobs)
+        return
+    workers = workers or os.cpu_count() or 1
+    pending: Deque = collections.deque()
+    pool = _new_pool(workers)
+    try:
+        for job in jobs:
+            pending.append((job, _submit(pool, job)))
+            if len(pending) >= IN_FLIGHT_PER_WORKER * workers:
+                result, pool = _next_result(pending, pool, workers)
+                yield result
+        while pending:
+            result, pool = _next_result(pending, pool, workers)
+            yield result
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve a JSONL stream of rescue scenarios.")
+    parser.add_argument("input", nargs="?", default="-", help="scenario JSONL file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="result JSONL file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-t", "--time-limit", type=float, default=DEFAULT_TIME_LIMIT,
+                        help="seconds per scenario, 0 for none")
+    parser.add_argument("--cache", default=None, help="SQLite solution cache file (default: none)")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input)
+    dst = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for result in solve_batch(src, args.workers, args.time_limit or None, args.cache):
+            dst.write(json.dumps(result) + "\n")
+            dst.flush()
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import batch_solver
+import instance_generator
+
+# seconds one benchmark run may search before it is recorded as a timeout
+DEFAULT_TIME_LIMIT = 30.0
+# (name, generate_scenario keyword arguments), smallest first
+DEFAULT_SIZES = [
+    ("s6", dict(num_ships=2, num_bases=2, num_colons=3, num_groups=6)),
+    ("s8", dict(num_ships=3, num_bases=3, num_colons=3, num_groups=8)),
+    ("s10", dict(num_ships=3, num_bases=3, num_colons=4, num_groups=10)),
+    ("s12", dict(num_ships=3, num_bases=4, num_colons=4, num_groups=12)),
+    ("s14", dict(num_ships=4, num_bases=4, num_colons=5, num_groups=14)),
+    ("s16", dict(num_ships=4, num_bases=5, num_colons=5, num_groups=16)),
+]
+DEFAULT_SEEDS = (0, 1, 2)
+# deadline tightness of the "deadline" variant; 1.0 keeps every instance feasible
+DEFAULT_TIGHTNESS = 1.0
+VARIANTS = ("standard", "deadline")
+# fields compare() reports old/new ratios for
+COMPARED = ("seconds", "expanded", "peak_memory_bytes")
+
+
+def run_case(scenario: Dict, limit: Optional[float] = DEFAULT_TIME_LIMIT, memory: bool = True) -> Dict:
+    """Solve one scenario with stats on and return its benchmark record.
+
+    Wall time and node counts come from an untraced run. With memory=True a
+    second, tracemalloc-traced run measures the peak Python heap, since
+    tracing slows the search too much to time it at the same time. It runs
+    under the same limit, and peak_memory_bytes is None when it times out.
+    """
+    record: Dict = {"status": "ok"}
+    try:
+        with batch_solver.time_limit(limit), contextlib.redirect_stdout(io.StringIO()):
+            scheduler = batch_solver.build_scheduler(scenario)
+            start = time.perf_counter()
+            end_state = scheduler.search(stats=True)
+            record["seconds"] = round(time.perf_counter() - start, 6)
+    except batch_solver.ScenarioTimeout:
+        record.update(status="timeout", seconds=limit)
+        return record
+    stats = scheduler.stats
+    if end_state is None:
+        record["status"] = "infeasible"
+    else:
+        record["makespan"] = end_state.g
+    if stats is not None:
+        record.update(expanded=stats.expanded, generated=stats.generated,
+                      peak_open=stats.peak_open)
+    if memory:
+        tracemalloc.start()
+        try:
+            with batch_solver.time_limit(limit), contextlib.redirect_stdout(io.StringIO()):
+                batch_solver.build_scheduler(scenario).search()
+            record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        except batch_solver.ScenarioTimeout:
+            record["peak_memory_bytes"] = None
+        finally:
+            tracemalloc.stop()
+    return record
+
+
+def run_suite(sizes=DEFAULT_SIZES, seeds=DEFAULT_SEEDS, variants=VARIANTS,
+              tightness: float = DEFAULT_TIGHTNESS, limit: Optional[float] = DEFAULT_TIME_LIMIT,
+              memory: bool = True, log=None) -> List[Dict]:
+    # sizes run smallest first; once every run of a size times out for a
+    # variant, its larger sizes are recorded as skipped.
+    results = []
+    gave_up = set()
+    for name, params in sizes:
+        timed_out = {variant: 0 for variant in variants}
+        for seed in seeds:
+            for variant in variants:
+                scenario = instance_generator.generate_scenario(
+                    seed, deadline_tightness=tightness if variant == "deadline" else None, **params)
+                record = {"case": name, "seed": seed, "variant": variant,
+                          "ships": params.get("num_ships"), "tasks": params.get("num_groups")}
+                if variant in gave_up:
+                    record["status"] = "skipped"
+                else:
+                    record.update(run_case(scenario, limit, memory))
+                    timed_out[variant] += record["status"] == "timeout"
+                results.append(record)
+                if log is not None:
+                    log.write(json.dumps(record) + "\n")
+                    log.flush()
+        gave_up.update(v for v, n in timed_out.items() if n == len(seeds))
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: List[Dict], limit: Optional[float], tightness: float) -> Dict:
+    return {"revision": git_revision(), "python": platform.python_version(),
+            "machine": platform.machine(), "time_limit": limit,
+            "deadline_tightness": tightness, "results": results}
+
+
+def compare(old: Dict, new: Dict) -> List[Dict]:
+    # new/old ratios per run present in both reports (below 1 is an improvement)
+    before = {(r["case"], r["seed"], r["variant"]): r for r in old["results"]}
+    rows = []
+    for r in new["results"]:
+        o = before.get((r["case"], r["seed"], r["variant"]))
+        if o is None:
+            continue
+        row = {"case": r["case"], "seed": r["seed"], "variant": r["variant"],
+               "status": f"{o['status']}->{r['status']}"}
+        for field in COMPARED:
+            if o.get(field) and r.get(field) is not None:
+                row[field] = round(r[field] / o[field], 3)
+        rows.append(row)
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark both schedulers on generated instances.")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: stdout)")
+    parser.add_argument("-t", "--time-limit", type=float, default=DEFAULT_TIME_LIMIT,
+                        help="seconds per run, 0 for none")
+    parser.add_argument("--seeds", type=int, default=len(DEFAULT_SEEDS), help="seeds per size")
+    parser.add_argument("--max-tasks", type=int, default=None, help="skip larger sizes")
+    parser.add_argument("--tightness", type=float, default=DEFAULT_TIGHTNESS)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced memory run")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="print new/old ratios of two reports instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            rows = compare(json.load(f_old), json.load(f_new))
+        for row in rows:
+            sys.stdout.write(json.dumps(row) + "\n")
+        return 0
+
+    sizes = [(name, params) for name, params in DEFAULT_SIZES
+             if args.max_tasks is None or params["num_groups"] <= args.max_tasks]
+    limit = args.time_limit or None
+    results = run_suite(sizes, range(args.seeds), VARIANTS, args.tightness, limit,
+                        not args.no_memory, log=sys.stderr)
+    report = build_report(results, limit, args.tightness)
+    text = json.dumps(report, indent=1, sort_keys=True) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import heapq
+import math
+from typing import List, Tuple
+
+ASSIGNMENT_MODES = ("greedy", "min_cost_flow")
+
+
+def assign_tasks(groups: List[int], capacities: List[int], travel_matrix: List[List[int]],
+                 mode: str = "greedy") -> List[Tuple[int, int, int]]:
+    """Turn per-base group counts into (base, colon, travel) tasks.
+
+    "greedy" gives exactly the tasks of calling `give_best_colon_for_base`
+    once per group, base by base. "min_cost_flow" minimises the total travel
+    over all groups instead. Tasks are listed base by base in both modes.
+    """
+    if mode not in ASSIGNMENT_MODES:
+        raise ValueError(f"unknown assignment mode {mode!r}, expected one of {ASSIGNMENT_MODES}")
+    if mode == "greedy":
+        return greedy_assignment(groups, capacities, travel_matrix)
+    return min_cost_flow_assignment(groups, capacities, travel_matrix)
+
+
+def greedy_assignment(groups: List[int], capacities: List[int],
+                      travel_matrix: List[List[int]]) -> List[Tuple[int, int, int]]:
+    # one heap per base, keyed (travel, colon) so ties go to the lower colon like
+    # min() in give_best_colon_for_base; full colonies are dropped when they
+    # surface instead of being filtered out on every group.
+    caps = list(capacities)
+    tasks: List[Tuple[int, int, int]] = []
+    for b, count in enumerate(groups):
+        if not count:
+            continue
+        row = travel_matrix[b]
+        heap = [(row[c], c) for c in range(len(caps)) if caps[c] > 0]
+        heapq.heapify(heap)
+        for _ in range(count):
+            while heap and caps[heap[0][1]] <= 0:
+                heapq.heappop(heap)
+            if not heap:
+                raise Exception('no capacities available')
+            travel, c = heap[0]
+            tasks.append((b, c, travel))
+            caps[c] -= 1
+    return tasks
+
+
+def min_cost_flow_assignment(groups: List[int], capacities: List[int],
+                             travel_matrix: List[List[int]]) -> List[Tuple[int, int, int]]:
+    # transportation problem, source -> base (groups[b]) -> colon (travel) ->
+    # sink (capacity), solved primal-dual: Dijkstra with Johnson potentials,
+    # then every path of zero reduced cost is augmented before the next round.
+    num_bases, num_colons = len(groups), len(capacities)
+    if sum(groups) > sum(c for c in capacities if c > 0):
+        raise Exception('no capacities available')
+    source, sink = num_bases + num_colons, num_bases + num_colons + 1
+    n = sink + 1
+    # edge: [to, residual capacity, cost, index of reverse edge]
+    graph: List[List[List[int]]] = [[] for _ in range(n)]
+
+    def add_edge(u, v, cap, cost):
+        graph[u].append([v, cap, cost, len(graph[v])])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+    for b in range(num_bases):
+        if groups[b] > 0:
+            add_edge(source, b, groups[b], 0)
+            for c in range(num_colons):
+                if capacities[c] > 0:
+                    add_edge(b, num_bases + c, groups[b], travel_matrix[b][c])
+    for c in range(num_colons):
+        if capacities[c] > 0:
+            add_edge(num_bases + c, sink, capacities[c], 0)
+
+    potential = [0] * n
+    need = sum(groups)
+    while need:
+        # Dijkstra on reduced costs, stopped once the sink is settled; nodes not
+        # settled take the sink distance so reduced costs stay non-negative.
+        dist = [math.inf] * n
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == sink:
+                break
+            pu = potential[u]
+            for v, cap, cost, _ in graph[u]:
+                nd = d + cost + pu - potential[v]
+                if cap > 0 and nd < dist[v]:
+                    dist[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        if dist[sink] == math.inf:
+            raise Exception('no capacities available')
+        for v in range(n):
+            potential[v] += min(dist[v], dist[sink])
+
+        # every source-sink path of zero reduced cost is now a shortest one:
+        # saturate them depth-first before running Dijkstra again.
+        arc = [0] * n
+        dead = [False] * n
+        while need:
+            on_path = [False] * n
+            on_path[source] = True
+            stack = [source]
+            while stack and stack[-1] != sink:
+                u = stack[-1]
+                adj = graph[u]
+                while arc[u] < len(adj):
+                    v, cap, cost, _ = adj[arc[u]]
+                    if cap > 0 and not dead[v] and not on_path[v] and cost + potential[u] == potential[v]:
+                        break
+                    arc[u] += 1
+                if arc[u] == len(adj):
+                    dead[u] = True
+                    on_path[u] = False
+                    stack.pop()
+                    continue
+                v = adj[arc[u]][0]
+                on_path[v] = True
+                stack.append(v)
+            if not stack:
+                break
+            path = [graph[u][arc[u]] for u in stack[:-1]]
+            push = min(need, min(edge[1] for edge in path))
+            for edge in path:
+                edge[1] -= push
+                graph[edge[0]][edge[3]][1] += push
+            need -= push
+
+    tasks: List[Tuple[int, int, int]] = []
+    for b in range(num_bases):
+        flows = [(travel_matrix[b][v - num_bases], v - num_bases, groups[b] - cap)
+                 for v, cap, _, _ in graph[b] if num_bases <= v < source and groups[b] - cap > 0]
+        for travel, c, amount in sorted(flows):
+            tasks.extend([(b, c, travel)] * amount)
+    return tasks
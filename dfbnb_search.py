@@ -0,0 +1,83 @@
+import math
+from typing import List, Optional, Tuple
+
+# closed-set entries the depth-first engine keeps before evicting
+DEFAULT_TABLE_SIZE = 100_000
+
+
+def depth_first_bnb(scheduler, init_state, seed_actions: Optional[List[Tuple[int, int]]],
+                    table_size: int = DEFAULT_TABLE_SIZE, budget=None):
+    """Depth-first branch and bound with a bounded transposition table.
+
+    Children are tried best-f first and cut once f reaches the best schedule
+    found so far (seeded with the replayed greedy schedule when it is
+    feasible). Apart from the table, memory is one sorted child list per level
+    of the current path, i.e. linear in the number of tasks: each level also
+    holds the node-pool length from before its parent was expanded, and the
+    pool is cut back to it when the level is done, so the pool only holds the
+    current path (plus the best schedule's, grafted). The table reuses
+    the scheduler's own closed-set rule (`is_dominated`). Whenever a state is
+    pruned by it, the dominating state's subtree has already been searched to
+    completion, because a state never shares a closed key with its
+    ancestors. The table holds at most `table_size` entries and evicts by
+    its own policy (see transposition_table) once full. When `budget` (a
+    search_budget.Budget) runs out, the best schedule so far is returned and
+    the smallest f left on the stack is recorded as the lower bound.
+    """
+    best = None
+    best_g = math.inf
+    best_path = None
+    if seed_actions is not None:
+        # the replayed path sits below every truncation point
+        best = scheduler.replay(seed_actions)
+        best_g = best.g
+
+    pool = scheduler.node_pool
+    stats = scheduler.stats
+    table = scheduler.new_closed_table(table_size)
+    # per level: its children, the pool length to truncate back to and the
+    # number of children; held is the states in all of the levels' lists
+    stack = [(iter([init_state]), len(pool), 1)]
+    held = 1
+    while stack:
+        cur = next(stack[-1][0], None)
+        if cur is None:
+            _, mark, size = stack.pop()
+            pool.truncate(mark)
+            held -= size
+            continue
+        if cur.f >= best_g:
+            continue
+
+        if cur.tasks_done == scheduler.all_done:
+            best, best_g = cur, cur.g
+            best_path = pool.actions(cur.parent, cur.action)
+            continue
+
+        if scheduler.is_dominated(table, cur):
+            continue
+
+        if budget is not None and budget.exhausted(scheduler, len(stack) * (scheduler.num_classes + 1), cur):
+            budget.stop(min([best_g, cur.f] + [s.f for level, _, _ in stack for s in level]))
+            return _graft(pool, best, best_path)
+
+        mark = len(pool)
+        children = [child for child in scheduler.expand(cur, best_g) if child.f < best_g]
+        if children:
+            children.sort(key=lambda s: (s.f, -s.g))
+            stack.append((iter(children), mark, len(children)))
+            held += len(children)
+            if stats is not None and held > stats.peak_open:
+                stats.peak_open = held
+        else:
+            pool.truncate(mark)
+
+    return _graft(pool, best, best_path)
+
+
+def _graft(pool, best, best_path):
+    # re-root a best state found by the search on its saved path, whose nodes
+    # may have been truncated since
+    if best_path is not None:
+        best.parent, best.action = pool.graft(best_path), None
+    return best
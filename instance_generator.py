@@ -0,0 +1,129 @@
+import argparse
+import json
+import math
+import random
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import colon_assignment
+import Standard_rescue_operations as standard
+
+MATRIX_STRUCTURES = ("uniform", "euclidean", "clustered")
+
+
+def split_count(rng: random.Random, total: int, parts: int, minimum: int = 0) -> List[int]:
+    # `total` split into `parts` random non-negative counts, each at least `minimum`
+    counts = [minimum] * parts
+    for _ in range(total - minimum * parts):
+        counts[rng.randrange(parts)] += 1
+    return counts
+
+
+def travel_matrix(rng: random.Random, num_bases: int, num_colons: int, structure: str = "uniform",
+                  travel_range: Tuple[int, int] = (1, 10)) -> List[List[int]]:
+    """Base-to-colony travel times, one row per base.
+
+    "uniform" draws every entry independently (the triangle inequality need
+    not hold); "euclidean" places bases and colonies in a square and rounds
+    distances up; "clustered" does the same around a few centres, so some
+    colonies are close to some bases and far from the rest.
+    """
+    lo, hi = travel_range
+    if structure == "uniform":
+        return [[rng.randint(lo, hi) for _ in range(num_colons)] for _ in range(num_bases)]
+    if structure == "euclidean":
+        def point():
+            return rng.uniform(0, hi), rng.uniform(0, hi)
+    elif structure == "clustered":
+        centres = [(rng.uniform(0, hi), rng.uniform(0, hi)) for _ in range(max(1, num_bases // 2))]
+        spread = hi / 10
+
+        def point():
+            x, y = rng.choice(centres)
+            return x + rng.gauss(0, spread), y + rng.gauss(0, spread)
+    else:
+        raise ValueError(f"unknown matrix structure {structure!r}, expected one of {MATRIX_STRUCTURES}")
+    bases = [point() for _ in range(num_bases)]
+    colons = [point() for _ in range(num_colons)]
+    return [[max(lo, math.ceil(math.dist(b, c))) for c in colons] for b in bases]
+
+
+def greedy_arrival(num_ships: int, tasks: List[Tuple[int, int, int]], to_base: List[int],
+                   matrix: List[List[int]]) -> List[float]:
+    # latest colony arrival per base in the standard scheduler's greedy schedule.
+    # Deadlines bound boarding, which comes before arrival, so a deadline of at
+    # least this is met by the greedy schedule, and the root check (earliest
+    # start plus base_approach, and the deadline windows) only bounds from below.
+    scheduler = standard.Scheduler(num_ships, tasks, to_base, matrix_time=matrix)
+    _, actions = scheduler.greedy_initial_schedule()
+    times = [0.0] * num_ships
+    prev = [-1] * num_ships
+    arrival = [0.0] * len(matrix)
+    for sh, tid in actions:
+        b, c, travel = tasks[tid]
+        times[sh] += (to_base[b] if prev[sh] == -1 else matrix[b][prev[sh]]) + travel
+        arrival[b] = max(arrival[b], times[sh])
+        prev[sh] = c
+    return arrival
+
+
+def generate_scenario(seed: int, num_ships: int = 3, num_bases: int = 3, num_colons: int = 3,
+                      num_groups: int = 7, capacity_slack: float = 1.5,
+                      setup_range: Tuple[int, int] = (1, 10), travel_range: Tuple[int, int] = (1, 10),
+                      matrix: str = "uniform", deadline_tightness: Optional[float] = None,
+                      deadline_share: float = 0.5, scenario_id=None) -> Dict:
+    """A random scenario dict in the format `batch_solver.build_scheduler` reads.
+
+    The same seed and arguments always give the same scenario. Every base gets
+    at least one group while num_groups allows it, and the colonies hold
+    ceil(num_groups * capacity_slack) groups between them (at least one
+    each when possible). With deadline_tightness set, a deadline_share of
+    the bases (at least one) get the deadline ceil(tightness * latest
+    arrival from that base in the greedy schedule). Tightness 1 or more is
+    then met by the greedy schedule itself; smaller values get harder and
+    may be infeasible.
+    """
+    rng = random.Random(seed)
+    groups = split_count(rng, num_groups, num_bases, 1 if num_groups >= num_bases else 0)
+    total_capacity = max(num_groups, math.ceil(num_groups * capacity_slack))
+    capacities = split_count(rng, total_capacity, num_colons, 1 if total_capacity >= num_colons else 0)
+    to_base = [rng.randint(*setup_range) for _ in range(num_bases)]
+    matrix_rows = travel_matrix(rng, num_bases, num_colons, matrix, travel_range)
+    scenario = {"id": seed if scenario_id is None else scenario_id, "num_ships": num_ships,
+                "groups": groups, "capacities": capacities, "to_base": to_base,
+                "travel_matrix": matrix_rows}
+    if deadline_tightness is not None:
+        tasks = colon_assignment.assign_tasks(groups, capacities, matrix_rows)
+        arrival = greedy_arrival(num_ships, tasks, to_base, matrix_rows)
+        served = [b for b in range(num_bases) if groups[b]]
+        chosen = set(rng.sample(served, max(1, round(deadline_share * len(served)))))
+        scenario["deadlines"] = [math.ceil(deadline_tightness * arrival[b]) if b in chosen else -1
+                                 for b in range(num_bases)]
+    return scenario
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write random rescue scenarios as JSONL.")
+    parser.add_argument("-n", "--count", type=int, default=1, help="scenarios to write")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first scenario")
+    parser.add_argument("--ships", type=int, default=3)
+    parser.add_argument("--bases", type=int, default=3)
+    parser.add_argument("--colons", type=int, default=3)
+    parser.add_argument("--groups", type=int, default=7, help="groups (tasks) over all bases")
+    parser.add_argument("--capacity-slack", type=float, default=1.5)
+    parser.add_argument("--matrix", choices=MATRIX_STRUCTURES, default="uniform")
+    parser.add_argument("--deadline-tightness", type=float, default=None,
+                        help="deadline as a multiple of the greedy arrival time (default: none)")
+    parser.add_argument("--deadline-share", type=float, default=0.5)
+    args = parser.parse_args(argv)
+    for seed in range(args.seed, args.seed + args.count):
+        scenario = generate_scenario(seed, args.ships, args.bases, args.colons, args.groups,
+                                     args.capacity_slack, matrix=args.matrix,
+                                     deadline_tightness=args.deadline_tightness,
+                                     deadline_share=args.deadline_share)
+        sys.stdout.write(json.dumps(scenario) + "\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import math
+import time
+from typing import List, Tuple
+
+# wall-clock budget of one improvement phase, in seconds
+DEFAULT_TIME_LIMIT = 0.05
+
+
+def routes_from_actions(num_ships: int, actions: List[Tuple[int, int]]) -> List[List[int]]:
+    routes: List[List[int]] = [[] for _ in range(num_ships)]
+    for sh, tid in actions:
+        routes[sh].append(tid)
+    return routes
+
+
+def actions_from_routes(routes: List[List[int]]) -> List[Tuple[int, int]]:
+    return [(sh, tid) for sh, route in enumerate(routes) for tid in route]
+
+
+def makespan(scheduler, actions: List[Tuple[int, int]]) -> float:
+    # makespan of an action list, inf while it misses a deadline
+    lateness, finish = scheduler.evaluate_routes(routes_from_actions(scheduler.num_ships, actions))
+    return math.inf if lateness > 0 else max(finish, default=0.0)
+
+
+def improve(scheduler, actions: List[Tuple[int, int]],
+            time_limit: float = DEFAULT_TIME_LIMIT) -> Tuple[float, List[Tuple[int, int]]]:
+    """First-improvement local search over per-ship task sequences.
+
+    Moves: relocate a task to any position of any ship (a same-ship relocate
+    is a reorder) and swap two tasks, on the same ship or across ships. Every
+    candidate is re-timed with the scheduler's `evaluate_routes`, so
+    `matrix_time` sequence-dependent setups (and deadline lateness in the
+    deadline variant) are exact. Candidates compare by (lateness, ship finish
+    times sorted descending): an infeasible start is repaired first, and
+    progress off the critical ship is not lost on makespan plateaus.
+    Returns (makespan, actions), where makespan is inf while any deadline is
+    still missed.
+    """
+    routes = routes_from_actions(scheduler.num_ships, actions)
+    stop_at = time.perf_counter() + time_limit
+
+    def score():
+        lateness, finish = scheduler.evaluate_routes(routes)
+        return lateness, sorted(finish, reverse=True)
+
+    best = score()
+    improved = True
+    while improved and time.perf_counter() < stop_at:
+        improved = False
+        for a in range(len(routes)):
+            for i in range(len(routes[a])):
+                if time.perf_counter() >= stop_at:
+                    break
+                if i >= len(routes[a]):
+                    break
+                # relocate routes[a][i]
+                task = routes[a].pop(i)
+                moved = False
+                for b in range(len(routes)):
+                    for j in range(len(routes[b]) + 1):
+                        if b == a and j == i:
+                            continue
+                        routes[b].insert(j, task)
+                        cand = score()
+                        if cand < best:
+                            best, moved = cand, True
+                            break
+                        routes[b].pop(j)
+                    if moved:
+                        break
+                if moved:
+                    improved = True
+                    continue
+                routes[a].insert(i, task)
+
+                # swap routes[a][i] with a later task
+                swapped = False
+                for b in range(a, len(routes)):
+                    for j in range(i + 1 if b == a else 0, len(routes[b])):
+                        routes[a][i], routes[b][j] = routes[b][j], routes[a][i]
+                        cand = score()
+                        if cand < best:
+                            best, swapped = cand, True
+                            break
+                        routes[a][i], routes[b][j] = routes[b][j], routes[a][i]
+                    if swapped:
+                        break
+                if swapped:
+                    improved = True
+
+    lateness, finish = best
+    makespan = math.inf if lateness > 0 else max(finish, default=0.0)
+    return makespan, actions_from_routes(routes)
@@ -0,0 +1,78 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# parent index of a search root
+ROOT = -1
+# ship code of a node standing for an action-less state (a root, or a grafted prefix)
+NO_ACTION = -1
+# task code of a ship-closing action, (ship, None)
+CLOSE = -1
+
+
+class NodePool:
+    """Append-only log of expanded search nodes in flat arrays.
+
+    Node i stores only its parent index and the (ship, task) action that
+    produced it, about 24 bytes, instead of a State holding its parent alive.
+    A State carries the index of its parent node and its own action, and gets
+    a node of its own only when it is expanded, so pruned and never-expanded
+    states can be freed as soon as the search drops them. `graft` starts a
+    path from an action prefix built elsewhere (another HDA* worker), and
+    `truncate` drops the nodes of a finished subtree (depth-first search).
+    """
+    __slots__ = ('parent', 'ship', 'task', 'prefixes')
+
+    def __init__(self):
+        self.parent = array('q')
+        self.ship = array('q')
+        self.task = array('q')
+        self.prefixes: Dict[int, Tuple[Tuple[int, Optional[int]], ...]] = {}
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, parent: int, action: Optional[Tuple[int, Optional[int]]]) -> int:
+        node = len(self.parent)
+        self.parent.append(parent)
+        if action is None:
+            self.ship.append(NO_ACTION)
+            self.task.append(CLOSE)
+        else:
+            sh, tid = action
+            self.ship.append(sh)
+            self.task.append(CLOSE if tid is None else tid)
+        return node
+
+    def truncate(self, size: int):
+        del self.parent[size:]
+        del self.ship[size:]
+        del self.task[size:]
+        for node in [n for n in self.prefixes if n >= size]:
+            del self.prefixes[node]
+
+    def graft(self, prefix: Tuple[Tuple[int, Optional[int]], ...]) -> int:
+        node = self.add(ROOT, None)
+        self.prefixes[node] = tuple(prefix)
+        return node
+
+    def path(self, node: int) -> List[Tuple[int, Optional[int]]]:
+        # actions from the search root down to and including `node`
+        path: List[Tuple[int, Optional[int]]] = []
+        head: Tuple = ()
+        while node != ROOT:
+            sh = self.ship[node]
+            if sh != NO_ACTION:
+                tid = self.task[node]
+                path.append((sh, None if tid == CLOSE else tid))
+            elif node in self.prefixes:
+                head = self.prefixes[node]
+            node = self.parent[node]
+        path.reverse()
+        return list(head) + path
+
+    def actions(self, parent: int, action: Optional[Tuple[int, Optional[int]]]) -> List[Tuple[int, Optional[int]]]:
+        # the path of a State that has no node of its own (e.g. a goal state)
+        path = self.path(parent)
+        if action is not None:
+            path.append(action)
+        return path
@@ -0,0 +1,158 @@
+import heapq
+import math
+import multiprocessing as mp
+import queue
+from typing import List, Optional, Tuple
+
+import node_pool
+
+# expansions a worker performs between inbox polls / outbox flushes
+BATCH_EXPANSIONS = 64
+# seconds the coordinator (and an idle worker) waits on its queue per poll
+POLL_INTERVAL = 0.005
+
+
+def owner(scheduler, state, workers: int) -> int:
+    # states that may prune each other (same closed key) land on the same worker;
+    # the high bits pick it, the low ones index the worker's closed table
+    return (scheduler.key_hash(state) >> 32) % workers
+
+
+def trail(scheduler, state) -> Tuple[Tuple[int, int], ...]:
+    # actions from the root of the whole search: the worker's node log ends at a
+    # node grafted from the prefix shipped along with a state from another worker.
+    return tuple(scheduler.node_pool.actions(state.parent, state.action))
+
+
+def _worker(me, scheduler, workers, inboxes, results, best, bound, sent, recv, idle, stop):
+    heap = []
+    closed = scheduler.new_closed_table()
+    scheduler.node_pool = node_pool.NodePool()
+    outbox: List[List[Tuple]] = [[] for _ in range(workers)]
+    inbox = inboxes[me]
+
+    def accept(batch):
+        idle[me] = 0
+        recv[me] += 1
+        for state, prefix in batch:
+            state.parent = scheduler.node_pool.graft(prefix)
+            state.action = None
+            heapq.heappush(heap, state)
+
+    while not stop.is_set():
+        while True:
+            try:
+                accept(inbox.get_nowait())
+            except queue.Empty:
+                break
+
+        expanded = 0
+        while heap and expanded < BATCH_EXPANSIONS:
+            incumbent = best.value
+            cur = heap[0]
+            if cur.f >= incumbent or cur.f > bound:
+                # the heap minimum cannot improve on the incumbent, nor can anything behind it
+                heap.clear()
+                break
+            heapq.heappop(heap)
+
+            if cur.tasks_done == scheduler.all_done:
+                with best.get_lock():
+                    if cur.g < best.value:
+                        best.value = cur.g
+                        results.put((cur.g, trail(scheduler, cur)))
+                continue
+
+            if scheduler.is_dominated(closed, cur):
+                continue
+            expanded += 1
+
+            for child in scheduler.expand(cur, bound):
+                if child.f >= incumbent:
+                    continue
+                dest = owner(scheduler, child, workers)
+                if dest == me:
+                    heapq.heappush(heap, child)
+                else:
+                    outbox[dest].append((child, trail(scheduler, child)))
+
+        for dest in range(workers):
+            if outbox[dest]:
+                sent[me] += 1
+                inboxes[dest].put(outbox[dest])
+                outbox[dest] = []
+
+        if not heap:
+            idle[me] = 1
+            try:
+                accept(inbox.get(timeout=POLL_INTERVAL))
+            except queue.Empty:
+                pass
+
+
+def hda_star(scheduler, init_state, incumbent: float, workers: int,
+             incumbent_actions: Optional[List[Tuple[int, int]]] = None):
+    """Hash-distributed A*: every state is owned by the worker its closed key
+    hashes to, each worker keeps its own open heap and closed set, and the best
+    goal cost is shared for pruning. The search stops once every worker is idle
+    and every message sent has been received, checked twice in a row. The
+    optimal (ship, task) actions, or the incumbent's when no worker beat it,
+    are replayed into a State chain on return."""
+    ctx = mp.get_context()
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    results = ctx.Queue()
+    best = ctx.Value('d', math.inf)
+    # slot `workers` of sent counts the coordinator's seeding message
+    sent = ctx.Array('q', workers + 1, lock=False)
+    recv = ctx.Array('q', workers, lock=False)
+    idle = ctx.Array('b', [1] * workers, lock=False)
+    stop = ctx.Event()
+
+    procs = [ctx.Process(target=_worker,
+                         args=(i, scheduler, workers, inboxes, results, best, incumbent,
+                               sent, recv, idle, stop),
+                         daemon=True)
+             for i in range(workers)]
+    for p in procs:
+        p.start()
+
+    sent[workers] = 1
+    inboxes[owner(scheduler, init_state, workers)].put([(init_state, ())])
+
+    best_g = math.inf
+    best_path: Optional[Tuple] = None
+
+    def collect(timeout):
+        nonlocal best_g, best_path
+        try:
+            g, path = results.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        if g < best_g:
+            best_g, best_path = g, path
+        return True
+
+    quiet = None
+    while True:
+        if collect(POLL_INTERVAL):
+            continue
+        all_idle = all(idle[i] for i in range(workers))
+        n_sent, n_recv = sum(sent), sum(recv)
+        if all_idle and n_sent == n_recv:
+            if quiet == n_sent:
+                break
+            quiet = n_sent
+        else:
+            quiet = None
+
+    stop.set()
+    for p in procs:
+        while p.is_alive():
+            collect(POLL_INTERVAL)
+            p.join(POLL_INTERVAL)
+    while collect(0):
+        pass
+
+    if best_path is None:
+        return None if incumbent_actions is None else scheduler.replay(incumbent_actions)
+    return scheduler.replay(list(best_path))
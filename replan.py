@@ -0,0 +1,87 @@
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import local_search
+
+
+def executed_state(scheduler, executed: List[Tuple[int, int]]) -> Tuple[List[float], List[int]]:
+    # per ship: the time it is free and the colon it is at once the executed
+    # (ship, task) actions are done as planned
+    routes = local_search.routes_from_actions(scheduler.num_ships, executed)
+    _, times = scheduler.evaluate_routes(routes)
+    colons = [scheduler.jobs[route[-1]][1] if route else scheduler.start_colons[sh]
+              for sh, route in enumerate(routes)]
+    return times, colons
+
+
+def seed_routes(scheduler, routes: List[List[int]], missing: Iterable[int]) -> List[List[int]]:
+    # cheapest insertion of each missing task into the routes, scored like
+    # local_search.improve: (lateness, ship finish times sorted descending)
+    for tid in missing:
+        best = None
+        for sh, route in enumerate(routes):
+            for i in range(len(route) + 1):
+                route.insert(i, tid)
+                lateness, finish = scheduler.evaluate_routes(routes)
+                score = (lateness, sorted(finish, reverse=True))
+                if best is None or score < best[0]:
+                    best = (score, sh, i)
+                route.pop(i)
+        routes[best[1]].insert(best[2], tid)
+    return routes
+
+
+def replan(scheduler, plan: List[Tuple[int, int]], executed: List[Tuple[int, int]],
+           ship_times: Optional[Sequence[float]] = None, ship_colons: Optional[Sequence[int]] = None,
+           delays: Optional[Dict[int, float]] = None,
+           added_tasks: Sequence[Tuple[int, int, int]] = (), removed_tasks: Iterable[int] = (),
+           **search_kwargs):
+    """Re-plan the rest of a mission from where it stands.
+
+    `scheduler` solved the original problem and `plan` is the (ship, task)
+    schedule being carried out, of which the actions in `executed` are done.
+    The ships start from `ship_times` / `ship_colons`, by default where the
+    executed actions leave them, plus any `delays` (ship -> extra time). The
+    remaining tasks are the unexecuted ones minus `removed_tasks` (old ids),
+    plus `added_tasks` as (base, colon, travel) jobs.
+
+    The rest of the old plan, with the added tasks put in at their cheapest
+    positions, seeds the incumbent of the new search. That is a fallback
+    (what a budget-limited search returns at worst), not a speed-up: the
+    greedy and local-search incumbent is usually as good, so the search
+    costs about what a fresh solve from the new start does. The closed set
+    is not carried over: its g values were reached from the old start, and
+    after a delay they are neither reachable nor lower bounds.
+
+    Returns (new scheduler, end state, task_ids), where task_ids[i] is the
+    old id of new task i, or None for an added task. search_kwargs go to
+    the new scheduler's search(); the seed and the wall time are kept in its
+    replan_report.
+    """
+    start = time.perf_counter()
+    done = {tid for _, tid in executed}
+    gone = done | set(removed_tasks)
+    if ship_times is None or ship_colons is None:
+        times, colons = executed_state(scheduler, executed)
+        ship_times = times if ship_times is None else ship_times
+        ship_colons = colons if ship_colons is None else ship_colons
+    ship_times = list(ship_times)
+    for sh, delay in (delays or {}).items():
+        ship_times[sh] += delay
+
+    task_ids: List[Optional[int]] = [tid for tid in range(scheduler.num_tasks) if tid not in gone]
+    new_id = {old: new for new, old in enumerate(task_ids)}
+    task_ids += [None] * len(added_tasks)
+    jobs = [scheduler.jobs[old] for old in task_ids if old is not None] + list(added_tasks)
+    new = scheduler.restarted(jobs, ship_times, ship_colons)
+
+    routes = [[new_id[tid] for tid in route if tid in new_id]
+              for route in local_search.routes_from_actions(scheduler.num_ships, plan)]
+    planned = {tid for route in routes for tid in route}
+    routes = seed_routes(new, routes, [tid for tid in range(new.num_tasks) if tid not in planned])
+    seed = local_search.actions_from_routes(routes)
+
+    end_state = new.search(seed_actions=seed, **search_kwargs)
+    new.replan_report = {"seed": local_search.makespan(new, seed),
+                         "seconds": time.perf_counter() - start}
+    return new, end_state, task_ids
@@ -0,0 +1,9 @@
+import colon_assignment
+
+# the worked example of Standard_rescue_operations.py's __main__, shared by the tests
+NUM_SHIPS = 3
+GROUPS = [1, 3, 3]
+CAPACITIES = [4, 4, 1]
+TO_BASE = [7, 4, 9]
+TRAVEL_MATRIX = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+TASKS = colon_assignment.assign_tasks(GROUPS, CAPACITIES, TRAVEL_MATRIX)
@@ -0,0 +1,93 @@
+import math
+import sys
+import time
+from typing import Dict, Optional
+
+# expansions between two wall-clock / memory checks
+CHECK_EVERY = 128
+# bytes per NodePool node: three array('q') entries
+NODE_BYTES = 24
+
+
+def state_bytes(state) -> int:
+    # one search state with the tuples it holds; children share some of them,
+    # so this over- rather than under-estimates
+    size = sys.getsizeof(state)
+    slots = (name for cls in type(state).__mro__ for name in getattr(cls, "__slots__", ()))
+    for name in slots:
+        value = getattr(state, name)
+        size += sys.getsizeof(value)
+        if isinstance(value, tuple):
+            size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+class Budget:
+    """Per-call limits on wall time, expanded nodes and search memory.
+
+    Engines call `exhausted` once per expansion. The node count is checked
+    every call; the clock and the memory estimate every CHECK_EVERY calls.
+    Memory is estimated as open states times the size of one state, plus the
+    closed table's columns and the node pool; it leaves out the values the
+    table stores and whatever the caller holds. On exhaustion the engine
+    stores the best proven lower bound with `stop`.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, nodes: Optional[int] = None,
+                 memory: Optional[int] = None):
+        self.deadline = None if seconds is None else time.perf_counter() + seconds
+        self.nodes = nodes
+        self.memory = memory
+        self.expanded = 0
+        self.reason: Optional[str] = None
+        self.lower_bound = -math.inf
+        self.state_size = 0
+
+    def exhausted(self, scheduler, open_count: int, sample) -> bool:
+        self.expanded += 1
+        if self.nodes is not None and self.expanded > self.nodes:
+            self.reason = "nodes"
+        elif self.expanded % CHECK_EVERY:
+            return False
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.reason = "time"
+        elif self.memory is not None and self.memory_estimate(scheduler, open_count, sample) >= self.memory:
+            self.reason = "memory"
+        return self.reason is not None
+
+    def memory_estimate(self, scheduler, open_count: int, sample) -> int:
+        if not self.state_size:
+            self.state_size = state_bytes(sample)
+        size = open_count * self.state_size + len(scheduler.node_pool) * NODE_BYTES
+        if scheduler.closed_table is not None:
+            size += scheduler.closed_table.nbytes()
+        return size
+
+    def stop(self, lower_bound: float):
+        self.lower_bound = lower_bound
+
+
+def search_report(result, budget: Optional[Budget]) -> Dict:
+    """scheduler.search_report for a search that returned `result`.
+
+    status is "optimal" or "infeasible" when the engine finished, and
+    "budget" (with the exhausted `reason`) when it stopped early. Then the
+    upper bound is the returned schedule's makespan (inf without one), the
+    lower bound the smallest f still open, and gap (upper - lower) / upper.
+    """
+    if budget is None or budget.reason is None:
+        if result is None:
+            return {"status": "infeasible", "reason": None, "upper_bound": math.inf,
+                    "lower_bound": math.inf, "gap": 0.0}
+        return {"status": "optimal", "reason": None, "upper_bound": result.g,
+                "lower_bound": result.g, "gap": 0.0}
+    upper = math.inf if result is None else result.g
+    lower = min(budget.lower_bound, upper)
+    if upper == math.inf:
+        gap = math.inf
+    elif upper > 0:
+        gap = (upper - lower) / upper
+    else:
+        gap = 0.0
+    return {"status": "budget", "reason": budget.reason, "upper_bound": upper,
+            "lower_bound": lower, "gap": gap}
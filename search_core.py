@@ -0,0 +1,802 @@
+import heapq
+import math
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import anytime_search
+import dfbnb_search
+import local_search
+import node_pool
+import parallel_search
+import search_budget
+import search_stats
+import transposition_table
+import vector_expansion
+
+SEARCH_ENGINES = ("astar", "dfbnb")
+HEURISTIC_MODES = ("basic", "inbound", "tight")
+
+
+class Pruner:
+    """One constraint or pruning stage of a Scheduler's search.
+
+    `active` tells whether the stage applies to a scheduler's instance at
+    all; `check_root` rejects a whole instance before the search starts and
+    `prune_child` a single child. A child is described by the parent's
+    per-class done counts, the job class it just served (-1 for a ship
+    closing), the sorted times of its open ships and its latest boarding
+    time per base (empty in the standard module). Subclasses override what
+    they need. A stage with `checks_incumbent` False is skipped when an
+    incumbent schedule is checked.
+    """
+
+    checks_incumbent = True
+
+    def active(self, scheduler) -> bool:
+        return True
+
+    def check_root(self, scheduler) -> Tuple[bool, str]:
+        return True, ""
+
+    def prune_child(self, scheduler, counts: List[int], served: int, open_times: List[float],
+                    base_boarding: Tuple[float, ...]) -> bool:
+        return False
+
+
+class DeadlinePruner(Pruner):
+    # the deadline module's per-base checks; inactive when every deadline is -1.
+    # An incumbent missing a deadline already has makespan inf, so the checks
+    # are not run on incumbents.
+    checks_incumbent = False
+
+    def active(self, scheduler) -> bool:
+        return bool(scheduler.deadline_bases)
+
+    def check_root(self, scheduler) -> Tuple[bool, str]:
+        return scheduler.check_deadlines_feasible_initial()
+
+    def prune_child(self, scheduler, counts, served, open_times, base_boarding) -> bool:
+        return scheduler.violates_deadlines(counts, served, open_times, base_boarding)
+
+
+class Pipeline:
+    """The active stages of a list of pruners, compiled once per scheduler.
+
+    `prune_child` is None when no stage is active, so an expansion loop can
+    skip the per-child bookkeeping the stages would read (sorting the open
+    ship times, updating boarding times) with a single test. One active
+    stage is called directly, several in order until one prunes.
+    """
+
+    def __init__(self, scheduler, pruners: Sequence[Pruner]):
+        self.stages = tuple(p for p in pruners if p.active(scheduler))
+        self.incumbent_stages = tuple(p for p in self.stages if p.checks_incumbent)
+        if not self.stages:
+            self.prune_child = None
+        elif len(self.stages) == 1:
+            self.prune_child = self.stages[0].prune_child
+        else:
+            self.prune_child = self.prune_child_all
+
+    def check_root(self, scheduler) -> Tuple[bool, str]:
+        for stage in self.stages:
+            ok, msg = stage.check_root(scheduler)
+            if not ok:
+                return ok, msg
+        return True, ""
+
+    def admits(self, scheduler, actions: List[Tuple[int, int]]) -> bool:
+        # whether no incumbent-checking stage prunes any step of a complete
+        # (ship, task) schedule; the schedule is followed one action at a time
+        if not self.incumbent_stages:
+            return True
+        times = list(scheduler.start_times)
+        prev = list(scheduler.start_colons)
+        counts = [0] * scheduler.num_classes
+        boarding = scheduler.initial_boarding()
+        for sh, tid in actions:
+            if tid is None:
+                continue
+            k = scheduler.task_class[tid]
+            base, colon, travel = scheduler.job_classes[k]
+            if prev[sh] == -1:
+                boarding_time = times[sh] + scheduler.setup[base]
+            else:
+                boarding_time = times[sh] + scheduler.matrix_time[base][prev[sh]]
+            times[sh] = boarding_time + travel
+            prev[sh] = colon
+            boarding = scheduler.boarded(boarding, base, boarding_time)
+            open_times = sorted(times)
+            for stage in self.incumbent_stages:
+                if stage.prune_child(scheduler, counts, k, open_times, boarding):
+                    return False
+            counts[k] += 1
+        return True
+
+    def prune_child_all(self, scheduler, counts, served, open_times, base_boarding) -> bool:
+        for stage in self.stages:
+            if stage.prune_child(scheduler, counts, served, open_times, base_boarding):
+                return True
+        return False
+
+
+def initial_incumbent(scheduler, improve: bool = True,
+                      seed_actions: Optional[List[Tuple[int, int]]] = None
+                      ) -> Tuple[float, Optional[List[Tuple[int, int]]]]:
+    # the scheduler's incumbent, or (inf, None) when it misses a deadline or
+    # some incumbent-checking stage would prune it: then it is no fallback
+    makespan, actions = scheduler.initial_incumbent(improve, seed_actions)
+    if makespan == math.inf or not scheduler.pipeline.admits(scheduler, actions):
+        return math.inf, None
+    return makespan, actions
+
+
+def search(scheduler, finish: Callable = lambda state: state, workers: int = 1, engine: str = "astar",
+           table_size: int = dfbnb_search.DEFAULT_TABLE_SIZE,
+           improve_incumbent: bool = True, stats: bool = False,
+           progress_callback: Optional[Callable[[search_stats.SearchStats], None]] = None,
+           progress_every: int = search_stats.DEFAULT_PROGRESS_EVERY,
+           time_budget: Optional[float] = None, node_budget: Optional[int] = None,
+           memory_budget: Optional[int] = None,
+           seed_actions: Optional[List[Tuple[int, int]]] = None):
+    """Scheduler.search of both solver modules.
+
+    Runs the pipeline's root checks, builds the incumbent and hands the
+    search to the chosen engine; `finish` completes the returned state (the
+    deadline module fills in per-task boarding times).
+    """
+    if engine not in SEARCH_ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {SEARCH_ENGINES}")
+    budget = None
+    if time_budget is not None or node_budget is not None or memory_budget is not None:
+        if engine == "astar" and workers > 1:
+            raise ValueError("search budgets are not supported with workers > 1")
+        budget = search_budget.Budget(time_budget, node_budget, memory_budget)
+    scheduler.node_pool = node_pool.NodePool()
+    scheduler.stats = None
+    scheduler.closed_table = None
+    init_state = scheduler.initial_state()
+
+    ok, msg = scheduler.pipeline.check_root(scheduler)
+    if not ok:
+        print("Initial feasibility check failed:", msg)
+        scheduler.search_report = search_budget.search_report(None, None)
+        return None
+
+    incumbent, incumbent_actions = initial_incumbent(scheduler, improve_incumbent, seed_actions)
+    if engine == "astar" and workers > 1:
+        result = parallel_search.hda_star(scheduler, init_state, incumbent, workers, incumbent_actions)
+        scheduler.search_report = search_budget.search_report(result, None)
+        return finish(result)
+
+    if stats or progress_callback is not None:
+        scheduler.stats = search_stats.SearchStats()
+    with search_stats.profiled(scheduler, scheduler.stats, progress_callback, progress_every):
+        if engine == "dfbnb":
+            result = dfbnb_search.depth_first_bnb(scheduler, init_state, incumbent_actions, table_size,
+                                                  budget)
+        else:
+            result = astar(scheduler, init_state, incumbent, incumbent_actions, budget)
+    scheduler.search_report = search_budget.search_report(result, budget)
+    return finish(result)
+
+
+def astar(scheduler, init_state, incumbent: float,
+          incumbent_actions: Optional[List[Tuple[int, int]]] = None,
+          budget: Optional[search_budget.Budget] = None):
+    heap = []
+    heapq.heappush(heap, init_state)
+    closed = scheduler.new_closed_table()
+    stats = scheduler.stats
+
+    while heap:
+        cur = heapq.heappop(heap)
+        if cur.tasks_done == scheduler.all_done:
+            return cur
+
+        if cur.g > incumbent:
+            if stats is not None:
+                stats.pruned_bound += 1
+            continue
+
+        if scheduler.is_dominated(closed, cur):
+            continue
+
+        if budget is not None and budget.exhausted(scheduler, len(heap), cur):
+            # cur was the smallest f left open; fall back on the incumbent
+            budget.stop(min(cur.f, incumbent))
+            return None if incumbent_actions is None else scheduler.replay(incumbent_actions)
+
+        for new_state in scheduler.expand(cur, incumbent):
+            heapq.heappush(heap, new_state)
+        if stats is not None and len(heap) > stats.peak_open:
+            stats.peak_open = len(heap)
+
+    # nothing beat the incumbent
+    return None if incumbent_actions is None else scheduler.replay(incumbent_actions)
+
+
+class State:
+    __slots__ = ('times', 'tasks_done', 'g', 'f', 'ship_prev_colons', 'parent', 'action',
+                 'remaining_work', 'total_time', 'base_boarding', 'closed_ships', 'key_hash',
+                 'task_boarding_times')
+
+    def __init__(self,
+                 times: Tuple[float, ...],
+                 tasks_done: int,
+                 g: float,
+                 f: float,
+                 ship_prev_colons: Optional[Tuple[int, ...]] = None,
+                 parent: int = node_pool.ROOT,
+                 action=None,
+                 remaining_work: float = 0.0,
+                 total_time: Optional[float] = None,
+                 base_boarding: Tuple[float, ...] = (),
+                 closed_ships: int = 0,
+                 key_hash: Optional[int] = None,
+                 task_boarding_times: Tuple[Optional[float], ...] = ()):
+        # tasks_done is the Scheduler's per-job-class done counter packed into an
+        # int (a plain bitmask when all jobs are distinct); the per-ship and
+        # per-base vectors are tuples so children share what they do not change.
+        self.times = times
+        self.tasks_done = tasks_done
+        self.g = g
+        self.f = f
+        if ship_prev_colons is None:
+            self.ship_prev_colons = (-1,) * len(times)
+        else:
+            self.ship_prev_colons = ship_prev_colons
+        # index of the parent's NodePool node and the (ship, task) action from it
+        self.parent = parent
+        self.action = action
+        # running sums feeding Scheduler.heuristic: min_service of the unserved
+        # tasks and the summed times of open ships; the max ship time is g itself.
+        self.remaining_work = remaining_work
+        self.total_time = sum(times) if total_time is None else total_time
+        # latest boarding time per base so far; empty unless the scheduler keeps them
+        self.base_boarding = base_boarding
+        # bitmask of ships the partial-order expansion has closed (given no more tasks)
+        self.closed_ships = closed_ships
+        # 64-bit hash of closed_key, kept up to date per move (Scheduler.state_hash)
+        self.key_hash = key_hash
+        # per-task boarding times; only set on the states the deadline module
+        # hands back (see its Scheduler.finished), empty during the search
+        self.task_boarding_times = task_boarding_times
+
+    def __lt__(self, other):
+        return self.f < other.f
+
+    def __repr__(self):
+        return f"State(g={self.g:.1f}, f={self.f:.1f}, times={self.times}, prev={self.ship_prev_colons})"
+
+
+class SchedulerBase:
+    """What both solver modules' Scheduler share.
+
+    Builds the job classes, heuristic tables and the pruner pipeline, and
+    implements child generation, the exact closed set, replay and the entry
+    points of every engine. A module adds its greedy incumbent
+    (`greedy_initial_schedule`), `evaluate_routes` and `restarted`. Hooks
+    with a no-op default let the deadline module add its boarding
+    bookkeeping (`initial_boarding`, `boarded`, `finished`), its tables and
+    `builtin_pruners`, and a dominance closed set in place of the exact one.
+    """
+
+    state_class = State
+    # stages every scheduler of the class runs before the caller's pruners
+    builtin_pruners: Tuple[Pruner, ...] = ()
+
+    def __init__(self,
+                 num_ships: int,
+                 base_to_colon: List[Tuple[int, int, float]],
+                 texas_to_base: List[float],
+                 matrix_time: List[List[int]],
+                 heuristic_mode: str = "basic",
+                 partial_order: bool = True,
+                 table_bytes: int = transposition_table.DEFAULT_MAX_BYTES,
+                 ship_times: Optional[Sequence[float]] = None,
+                 ship_colons: Optional[Sequence[int]] = None,
+                 vectorized: bool = False,
+                 pruners: Sequence[Pruner] = ()):
+        self.num_ships = num_ships
+        # where the ships start: the time each is free and the colon it is at
+        # (-1 for not yet launched); a re-plan starts mid-mission
+        self.start_times = (0.0,) * num_ships if ship_times is None else tuple(map(float, ship_times))
+        self.start_colons = (-1,) * num_ships if ship_colons is None else tuple(ship_colons)
+        self.partial_order = partial_order
+        self.node_pool = node_pool.NodePool()
+        self.table_bytes = table_bytes
+        self.closed_table = None
+        self.jobs = base_to_colon
+        self.setup = texas_to_base
+        self.matrix_time = matrix_time
+        self.num_tasks = len(self.jobs)
+        self.min_service = []
+        for (b, c, travel) in self.jobs:
+            min_return = min(self.matrix_time[b])
+            self.min_service.append(travel + min(self.setup[b], min_return))
+        self._build_job_classes()
+        self._build_zobrist_tables()
+        if heuristic_mode not in HEURISTIC_MODES:
+            raise ValueError(f"unknown heuristic_mode {heuristic_mode!r}, expected one of {HEURISTIC_MODES}")
+        self.heuristic_mode = heuristic_mode
+        self._build_heuristic_tables()
+        # vectorized=True computes each expansion's children as one NumPy batch
+        self.vectorized = vectorized
+        self.service_table = vector_expansion.ServiceTable(self) if vectorized else None
+        self._build_pruner_tables()
+        # the built-in stages plus any extra ones; prune_child is None when
+        # none is active
+        self.pruners = tuple(pruners)
+        self.pipeline = Pipeline(self, self.builtin_pruners + self.pruners)
+        self.prune_child = self.pipeline.prune_child
+
+    def _build_job_classes(self):
+        # identical (base, colon, travel) tasks are interchangeable, so the search
+        # branches once per job class and serves each class's task ids in order.
+        class_of: Dict[Tuple, int] = {}
+        self.job_classes: List[Tuple[int, int, float]] = []
+        self.class_tasks: List[List[int]] = []
+        self.task_class: List[int] = []
+        for tid, job in enumerate(self.jobs):
+            k = class_of.get(job)
+            if k is None:
+                k = class_of[job] = len(self.job_classes)
+                self.job_classes.append(job)
+                self.class_tasks.append([])
+            self.class_tasks[k].append(tid)
+            self.task_class.append(k)
+        self.num_classes = len(self.job_classes)
+        self.class_min_service = [self.min_service[tids[0]] for tids in self.class_tasks]
+        # tasks_done is a mixed-radix counter: digit k (place value radix[k])
+        # holds how many tasks of class k are served.
+        self.radix: List[int] = []
+        place = 1
+        for tids in self.class_tasks:
+            self.radix.append(place)
+            place *= len(tids) + 1
+        self.all_done = place - 1
+
+    def done_counts(self, tasks_done: int) -> List[int]:
+        counts = []
+        for tids in self.class_tasks:
+            tasks_done, cnt = divmod(tasks_done, len(tids) + 1)
+            counts.append(cnt)
+        return counts
+
+    def _build_zobrist_tables(self):
+        # random 64-bit keys per (job class, done count); ship keys are drawn
+        # lazily by ship_hash
+        self.class_zobrist = transposition_table.zobrist_keys(len(tids) + 1 for tids in self.class_tasks)
+        self.ship_zobrist: Dict[Tuple[float, int, int], int] = {}
+
+    def _build_heuristic_tables(self):
+        # per-class lower bound on one service. "basic" lets a ship come back
+        # from any colon; the other modes only from colons some job ends at or
+        # some ship starts at.
+        if self.heuristic_mode == "basic":
+            self.class_lb_service = self.class_min_service
+            return
+        end_colons = sorted({c for (_, c, _) in self.job_classes} | {c for c in self.start_colons if c != -1})
+        self.class_lb_service = []
+        self.class_inbound = []
+        for (b, c, travel) in self.job_classes:
+            inbound = min(self.matrix_time[b][col] for col in end_colons)
+            self.class_inbound.append(inbound)
+            self.class_lb_service.append(travel + min(self.setup[b], inbound))
+
+    def _build_pruner_tables(self):
+        # tables the built-in pruners read; none here
+        pass
+
+    def heuristic(self, tasks_done: int, remaining_work: float, total_time: float, max_time: float,
+                  times: Optional[Tuple[float, ...]] = None,
+                  prev_cols: Optional[Tuple[int, ...]] = None, closed_ships: int = 0) -> float:
+        if tasks_done == self.all_done:
+            return 0.0
+        # remaining work can only go to open ships, whose times total_time sums
+        m = self.num_ships - bin(closed_ships).count("1")
+        LB_final = max(max_time, math.ceil((total_time + remaining_work) / m))
+        if self.heuristic_mode == "tight" and times is not None:
+            LB_final = max(LB_final, self.open_longest_job_bound(tasks_done, times, prev_cols, closed_ships))
+        return max(0.0, LB_final - max_time)
+
+    def batch_heuristic(self, new_g, new_total, new_work, closed_ships: int, finishing: bool):
+        # heuristic's load-balancing LB_final (not h) over a batch of children;
+        # the "tight" term is added per child that survives this bound
+        m = self.num_ships - bin(closed_ships).count("1")
+        return vector_expansion.load_bound(new_g, new_total, new_work, m, finishing)
+
+    def open_longest_job_bound(self, tasks_done: int, times: Tuple[float, ...],
+                               prev_cols: Tuple[int, ...], closed_ships: int) -> float:
+        if closed_ships:
+            open_ships = [sh for sh in range(self.num_ships) if not closed_ships >> sh & 1]
+            times = tuple(times[sh] for sh in open_ships)
+            prev_cols = tuple(prev_cols[sh] for sh in open_ships)
+        return self.longest_job_bound(tasks_done, times, prev_cols)
+
+    def longest_job_bound(self, tasks_done: int, times: Tuple[float, ...], prev_cols: Tuple[int, ...]) -> float:
+        # every remaining job still needs a ship, so the earliest any ship could
+        # finish it bounds the makespan. A ship either goes there straight from
+        # where it is, or first serves some other job (at least the cheapest
+        # remaining lower bound) and then comes in from a job's colon; the
+        # matrix need not obey the triangle inequality, so both are needed.
+        earliest: Dict[int, float] = {}
+        for t, p in zip(times, prev_cols):
+            if t < earliest.get(p, math.inf):
+                earliest[p] = t
+        remaining = [k for k, cnt in enumerate(self.done_counts(tasks_done))
+                     if cnt < len(self.class_tasks[k])]
+        detour = min(times) + min(self.class_lb_service[k] for k in remaining)
+        bound = 0.0
+        for k in remaining:
+            b, _, travel = self.job_classes[k]
+            start = min(t + (self.setup[b] if p == -1 else self.matrix_time[b][p])
+                        for p, t in earliest.items())
+            finish = min(start, detour + self.class_inbound[k]) + travel
+            if finish > bound:
+                bound = finish
+        return bound
+
+    def greedy_initial_solution(self) -> float:
+        return self.greedy_initial_schedule()[0]
+
+    def initial_incumbent(self, improve: bool = True,
+                          seed_actions: Optional[List[Tuple[int, int]]] = None
+                          ) -> Tuple[float, List[Tuple[int, int]]]:
+        # seed_actions, e.g. a previous plan, replaces the greedy schedule when shorter
+        makespan, actions = self.greedy_initial_schedule()
+        self.incumbent_report = {"greedy": makespan, "improved": makespan, "seconds": 0.0}
+        if seed_actions is not None:
+            seeded = local_search.makespan(self, seed_actions)
+            self.incumbent_report["seed"] = seeded
+            if seeded <= makespan:
+                makespan, actions = seeded, list(seed_actions)
+                self.incumbent_report["improved"] = makespan
+        if improve:
+            start = time.perf_counter()
+            makespan, actions = local_search.improve(self, actions)
+            self.incumbent_report.update(improved=makespan, seconds=time.perf_counter() - start)
+        return makespan, actions
+
+    def initial_boarding(self) -> Tuple[float, ...]:
+        # the root's per-base boarding times; none are kept here
+        return ()
+
+    def boarded(self, base_boarding: Tuple[float, ...], base: int, boarding_time: float) -> Tuple[float, ...]:
+        # per-base boarding times after a task of `base` boards at boarding_time;
+        # only called while some pruner reads them
+        return base_boarding
+
+    def finished(self, state: Optional[State]) -> Optional[State]:
+        # completes a state before it is handed back to the caller
+        return state
+
+    def canonical_key(self, tasks_done, times, prev_cols, closed_ships=0):
+        if closed_ships:
+            flags = tuple(closed_ships >> sh & 1 for sh in range(self.num_ships))
+            return tasks_done, tuple(sorted(zip(times, prev_cols, flags)))
+        return tasks_done, tuple(sorted(zip(times, prev_cols)))
+
+    def closed_key(self, state: State) -> Tuple:
+        return self.canonical_key(state.tasks_done, state.times, state.ship_prev_colons, state.closed_ships)
+
+    def open_times(self, times: Tuple[float, ...], closed_ships: int) -> List[float]:
+        # sorted times of the open ships, as the pruners read them
+        if closed_ships:
+            return sorted(t for sh, t in enumerate(times) if not closed_ships >> sh & 1)
+        return sorted(times)
+
+    def distinct_ships(self, times: Tuple[float, ...], prev_cols: Tuple[int, ...]) -> List[int]:
+        # ships with the same (time, previous colon) produce equivalent children,
+        # so only the first ship of each such group is branched on.
+        seen = set()
+        ships = []
+        for sh, ship in enumerate(zip(times, prev_cols)):
+            if ship not in seen:
+                seen.add(ship)
+                ships.append(sh)
+        return ships
+
+    def ship_hash(self, time: float, prev_col: int, closed: int) -> int:
+        # the Zobrist key of one ship, filled in lazily: ship times are not
+        # known up front, but few distinct (time, colon) pairs ever occur
+        ship = (time, prev_col, closed)
+        key = self.ship_zobrist.get(ship)
+        if key is None:
+            key = self.ship_zobrist[ship] = transposition_table.mix64(hash(ship))
+        return key
+
+    def state_hash(self, tasks_done: int, times: Tuple[float, ...], prev_cols: Tuple[int, ...],
+                   closed_ships: int = 0) -> int:
+        # Zobrist-style hash of closed_key: the random key of each class's
+        # done count plus the key of each ship. Ships are summed, not chained,
+        # so the hash ignores ship order, and a move only swaps two terms.
+        h = sum(z[cnt] for z, cnt in zip(self.class_zobrist, self.done_counts(tasks_done)))
+        for sh, (t, p) in enumerate(zip(times, prev_cols)):
+            h += self.ship_hash(t, p, closed_ships >> sh & 1)
+        return h & transposition_table.MASK64
+
+    def key_hash(self, state: State) -> int:
+        if state.key_hash is None:
+            state.key_hash = self.state_hash(state.tasks_done, state.times, state.ship_prev_colons,
+                                             state.closed_ships)
+        return state.key_hash
+
+    def new_closed_table(self, max_entries: Optional[int] = None) -> transposition_table.TranspositionTable:
+        # a fresh closed set for one search, kept as closed_table for its stats()
+        self.closed_table = transposition_table.TranspositionTable(self.table_bytes, max_entries)
+        return self.closed_table
+
+    def is_dominated(self, closed: transposition_table.TranspositionTable, state: State) -> bool:
+        # an identical state (same served tasks, same multiset of (time, colon))
+        # closed with no larger g makes `state` redundant.
+        key = self.key_hash(state)
+        g = closed.get(key)
+        if g is not None and g <= state.g:
+            return True
+        closed.put(key, state.g)
+        return False
+
+    def initial_state(self) -> State:
+        init_times = self.start_times
+        init_tasks_done = 0
+        init_prev = self.start_colons
+        init_work = sum(lb * len(tids) for lb, tids in zip(self.class_lb_service, self.class_tasks))
+        init_total = sum(init_times)
+        init_g = max(init_times, default=0.0)
+        init_h = self.heuristic(init_tasks_done, init_work, init_total, init_g)
+        return self.state_class(times=init_times, tasks_done=init_tasks_done, g=init_g, f=init_g + init_h,
+                                ship_prev_colons=init_prev, remaining_work=init_work, total_time=init_total,
+                                base_boarding=self.initial_boarding(),
+                                key_hash=self.state_hash(init_tasks_done, init_times, init_prev))
+
+    def expand(self, cur: State, incumbent: float) -> Iterator[State]:
+        counts = self.done_counts(cur.tasks_done)
+        node = self.node_pool.add(cur.parent, cur.action)
+        if self.partial_order:
+            yield from self.expand_earliest_ship(cur, incumbent, counts, node)
+            return
+        ships = self.distinct_ships(cur.times, cur.ship_prev_colons)
+        expand_ships = self.expand_ships_vectorized if self.vectorized else self.expand_ships
+        yield from expand_ships(cur, incumbent, counts, ships, node)
+
+    def expand_earliest_ship(self, cur: State, incumbent: float, counts: List[int],
+                             node: int) -> Iterator[State]:
+        # Partial-order reduction: the per-ship task sequences of any schedule
+        # can be built by always extending the open ship that finishes first
+        # (lowest index on ties), closing it once its sequence is complete. So
+        # only that ship branches: on each open job class, or on being closed
+        # while another ship is still open. Assignments to different ships no
+        # longer commute into duplicate paths. Closing re-runs the pruners,
+        # since the remaining services now have fewer ships to go to.
+        open_ships = [sh for sh in range(self.num_ships) if not cur.closed_ships >> sh & 1]
+        sh = min(open_ships, key=cur.times.__getitem__)
+        expand_ships = self.expand_ships_vectorized if self.vectorized else self.expand_ships
+        yield from expand_ships(cur, incumbent, counts, [sh], node)
+        if len(open_ships) < 2:
+            return
+        new_closed = cur.closed_ships | 1 << sh
+        new_total = cur.total_time - cur.times[sh]
+        h = self.heuristic(cur.tasks_done, cur.remaining_work, new_total, cur.g,
+                           cur.times, cur.ship_prev_colons, new_closed)
+        if cur.g + h > incumbent:
+            return
+        prune_child = self.prune_child
+        if prune_child is not None and prune_child(
+                self, counts, -1, sorted(cur.times[s] for s in open_ships if s != sh), cur.base_boarding):
+            return
+        t, p = cur.times[sh], cur.ship_prev_colons[sh]
+        key_hash = (cur.key_hash - self.ship_hash(t, p, 0) + self.ship_hash(t, p, 1)
+                    ) & transposition_table.MASK64
+        yield self.state_class(cur.times, cur.tasks_done, cur.g, cur.g + h,
+                               ship_prev_colons=cur.ship_prev_colons,
+                               parent=node, action=(sh, None),
+                               remaining_work=cur.remaining_work, total_time=new_total,
+                               base_boarding=cur.base_boarding, closed_ships=new_closed,
+                               key_hash=key_hash)
+
+    def expand_ships(self, cur: State, incumbent: float, counts: List[int],
+                     ships: List[int], node: int) -> Iterator[State]:
+        # each child's key_hash swaps its ship's old key for the new one
+        leave = {sh: cur.key_hash - self.ship_hash(cur.times[sh], cur.ship_prev_colons[sh], 0)
+                 for sh in ships}
+        prune_child = self.prune_child
+        for k, (base, colon, travel) in enumerate(self.job_classes):
+            tids = self.class_tasks[k]
+            if counts[k] == len(tids):
+                continue
+            tsk_id = tids[counts[k]]
+            new_tasks_done = cur.tasks_done + self.radix[k]
+            new_work = cur.remaining_work - self.class_lb_service[k]
+            zobrist = self.class_zobrist[k]
+            class_step = zobrist[counts[k] + 1] - zobrist[counts[k]]
+            for sh in ships:
+                start = cur.times[sh]
+                prev_col = cur.ship_prev_colons[sh]
+                if prev_col == -1:
+                    boarding_time = start + self.setup[base]
+                else:
+                    boarding_time = start + self.matrix_time[base][prev_col]
+                arrival_time = boarding_time + travel
+
+                new_times = cur.times[:sh] + (arrival_time,) + cur.times[sh + 1:]
+                new_prev = cur.ship_prev_colons[:sh] + (colon,) + cur.ship_prev_colons[sh + 1:]
+                new_g = max(cur.g, arrival_time)
+                new_total = cur.total_time + (arrival_time - start)
+                h = self.heuristic(new_tasks_done, new_work, new_total, new_g, new_times, new_prev,
+                                   cur.closed_ships)
+
+                if new_g + h > incumbent:
+                    continue
+                new_base_boarding = cur.base_boarding
+                if prune_child is not None:
+                    new_base_boarding = self.boarded(cur.base_boarding, base, boarding_time)
+                    if prune_child(self, counts, k, self.open_times(new_times, cur.closed_ships),
+                                   new_base_boarding):
+                        continue
+
+                key_hash = (leave[sh] + class_step + self.ship_hash(arrival_time, colon, 0)
+                            ) & transposition_table.MASK64
+                yield self.state_class(new_times, new_tasks_done, new_g, new_g + h,
+                                       ship_prev_colons=new_prev,
+                                       parent=node, action=(sh, tsk_id),
+                                       remaining_work=new_work, total_time=new_total,
+                                       base_boarding=new_base_boarding, closed_ships=cur.closed_ships,
+                                       key_hash=key_hash)
+
+    def expand_ships_vectorized(self, cur: State, incumbent: float, counts: List[int],
+                                ships: List[int], node: int) -> Iterator[State]:
+        # expand_ships with the arithmetic and load bound of every (open class,
+        # ship) child done as one NumPy batch; the pruners and States follow
+        # for the children within the bound, in expand_ships' order.
+        classes = [k for k, cnt in enumerate(counts) if cnt < len(self.class_tasks[k])]
+        finishing = sum(len(self.class_tasks[k]) - counts[k] for k in classes) == 1
+        boarding, arrival, new_g, new_total, new_work = vector_expansion.boarding_batch(
+            self.service_table, classes, ships, cur.times, cur.ship_prev_colons,
+            cur.g, cur.total_time, cur.remaining_work)
+        lb = self.batch_heuristic(new_g, new_total, new_work, cur.closed_ships, finishing)
+        rows, cols = vector_expansion.within(new_g + (lb - new_g), incumbent)
+        if not rows:
+            return
+        boarding, arrival, new_g, new_total, new_work, lb = (
+            a.tolist() for a in (boarding, arrival, new_g, new_total, new_work, lb))
+        tight = self.heuristic_mode == "tight" and not finishing
+        prune_child = self.prune_child
+        leave = {}
+        for r, c in zip(rows, cols):
+            k, sh = classes[r], ships[c]
+            base, colon, travel = self.job_classes[k]
+            new_tasks_done = cur.tasks_done + self.radix[k]
+            new_times = cur.times[:sh] + (arrival[r][c],) + cur.times[sh + 1:]
+            new_prev = cur.ship_prev_colons[:sh] + (colon,) + cur.ship_prev_colons[sh + 1:]
+            g = new_g[r][c]
+            LB_final = lb[r][c]
+            if tight:
+                LB_final = max(LB_final, self.open_longest_job_bound(new_tasks_done, new_times, new_prev,
+                                                                     cur.closed_ships))
+            h = max(0.0, LB_final - g)
+            if g + h > incumbent:
+                continue
+            new_base_boarding = cur.base_boarding
+            if prune_child is not None:
+                new_base_boarding = self.boarded(cur.base_boarding, base, boarding[r][c])
+                if prune_child(self, counts, k, self.open_times(new_times, cur.closed_ships),
+                               new_base_boarding):
+                    continue
+
+            if sh not in leave:
+                leave[sh] = cur.key_hash - self.ship_hash(cur.times[sh], cur.ship_prev_colons[sh], 0)
+            zobrist = self.class_zobrist[k]
+            key_hash = (leave[sh] + zobrist[counts[k] + 1] - zobrist[counts[k]]
+                        + self.ship_hash(arrival[r][c], colon, 0)) & transposition_table.MASK64
+            yield self.state_class(new_times, new_tasks_done, g, g + h,
+                                   ship_prev_colons=new_prev,
+                                   parent=node, action=(sh, self.class_tasks[k][counts[k]]),
+                                   remaining_work=new_work[r][0], total_time=new_total[r][c],
+                                   base_boarding=new_base_boarding, closed_ships=cur.closed_ships,
+                                   key_hash=key_hash)
+
+    def search(self, workers: int = 1, engine: str = "astar",
+               table_size: int = dfbnb_search.DEFAULT_TABLE_SIZE,
+               improve_incumbent: bool = True, stats: bool = False,
+               progress_callback: Optional[Callable[[search_stats.SearchStats], None]] = None,
+               progress_every: int = search_stats.DEFAULT_PROGRESS_EVERY,
+               time_budget: Optional[float] = None, node_budget: Optional[int] = None,
+               memory_budget: Optional[int] = None,
+               seed_actions: Optional[List[Tuple[int, int]]] = None) -> Optional[State]:
+        # stats=True (or a progress_callback) leaves a SearchStats in self.stats;
+        # it is not collected across HDA* worker processes. Once a budget (seconds,
+        # expanded nodes, estimated bytes) runs out, the best schedule found so
+        # far is returned and self.search_report holds the bounds and gap.
+        # seed_actions is a known schedule to start the incumbent from.
+        return search(self, self.finished, workers=workers, engine=engine, table_size=table_size,
+                      improve_incumbent=improve_incumbent, stats=stats,
+                      progress_callback=progress_callback, progress_every=progress_every,
+                      time_budget=time_budget, node_budget=node_budget,
+                      memory_budget=memory_budget, seed_actions=seed_actions)
+
+    def astar(self, init_state: State, incumbent: float,
+              incumbent_actions: Optional[List[Tuple[int, int]]] = None,
+              budget: Optional[search_budget.Budget] = None) -> Optional[State]:
+        return astar(self, init_state, incumbent, incumbent_actions, budget)
+
+    def anytime_search(self, weights: Tuple[float, ...] = anytime_search.DEFAULT_WEIGHTS
+                       ) -> Iterator[Tuple[State, float]]:
+        anytime_search.check_weights(weights)
+        # no SearchStats here: drop the previous search's, so none is read as this one's
+        self.node_pool = node_pool.NodePool()
+        self.stats = None
+        ok, msg = self.pipeline.check_root(self)
+        if not ok:
+            print("Initial feasibility check failed:", msg)
+            return iter(())
+        makespan, actions = initial_incumbent(self)
+        stream = anytime_search.weighted_astar(self, self.initial_state(), actions, weights)
+        return ((self.finished(state), bound) for state, bound in stream)
+
+    def replay(self, actions: List[Tuple[int, int]]) -> State:
+        # rebuild the state reached by a (ship, task_id) action list, logging its
+        # path in the node pool; task ids are relabelled within their job class
+        # so the path obeys the class order.
+        cur = self.initial_state()
+        for sh, tid in actions:
+            if tid is None:
+                # ship closings from the partial-order expansion do not change the schedule
+                continue
+            k = self.task_class[tid]
+            base, colon, travel = self.job_classes[k]
+            tsk_id = self.class_tasks[k][self.done_counts(cur.tasks_done)[k]]
+            start = cur.times[sh]
+            prev_col = cur.ship_prev_colons[sh]
+            if prev_col == -1:
+                boarding_time = start + self.setup[base]
+            else:
+                boarding_time = start + self.matrix_time[base][prev_col]
+            arrival_time = boarding_time + travel
+            new_times = cur.times[:sh] + (arrival_time,) + cur.times[sh + 1:]
+            new_prev = cur.ship_prev_colons[:sh] + (colon,) + cur.ship_prev_colons[sh + 1:]
+            new_tasks_done = cur.tasks_done + self.radix[k]
+            new_work = cur.remaining_work - self.class_lb_service[k]
+            new_total = cur.total_time + (arrival_time - start)
+            new_g = max(cur.g, arrival_time)
+            h = self.heuristic(new_tasks_done, new_work, new_total, new_g, new_times, new_prev)
+            node = self.node_pool.add(cur.parent, cur.action)
+            cur = self.state_class(new_times, new_tasks_done, new_g, new_g + h,
+                                   ship_prev_colons=new_prev,
+                                   parent=node, action=(sh, tsk_id),
+                                   remaining_work=new_work, total_time=new_total,
+                                   base_boarding=self.boarded(cur.base_boarding, base, boarding_time),
+                                   key_hash=self.state_hash(new_tasks_done, new_times, new_prev))
+        return self.finished(cur)
+
+    def reconstruct(self, end_state: State) -> List[Tuple[int, int]]:
+        # (ship, task) actions of the latest search's node log, closings dropped
+        return [action for action in self.node_pool.actions(end_state.parent, end_state.action)
+                if action[1] is not None]
+
+    def print_schedule_with_stages(self, end_state: State):
+        schedule = self.reconstruct(end_state)
+        base_to_colon = self.jobs
+        current_times = list(self.start_times)
+        prev_col = list(self.start_colons)
+        detailed = []
+
+        for (ship_idx, task_id) in schedule:
+            base_idx, colon_idx, travel = base_to_colon[task_id]
+            if prev_col[ship_idx] == -1:
+                service = self.setup[base_idx] + travel
+            else:
+                service = self.matrix_time[base_idx][prev_col[ship_idx]] + travel
+            start = current_times[ship_idx]
+            end = start + service
+            current_times[ship_idx] = end
+            prev_col[ship_idx] = colon_idx
+            detailed.append((ship_idx, task_id, base_idx, colon_idx, service, start, end))
+
+        detailed.sort(key=lambda x: x[5])
+        for step, detail in enumerate(detailed):
+            ship_idx, task_id, base_idx, colon_idx, service, start, end = detail
+            print(
+                f"step: {step}, ship_idx: {ship_idx}, base_idx: {base_idx}, colon_idx: {colon_idx}, start: {start}, end: {end}"
+            )
@@ -0,0 +1,131 @@
+import contextlib
+import time
+from typing import Callable, Dict, Optional
+
+# expansions between two progress_callback calls
+DEFAULT_PROGRESS_EVERY = 10_000
+
+
+class SearchStats:
+    """Counters and timings of one Scheduler.search call.
+
+    pruned_bound counts children cut by the incumbent bound (in `expand`, or
+    when A* pops them), pruned_deadline children cut by the scheduler's
+    pruners (the deadline check) and pruned_duplicate states dropped by the
+    closed set. peak_open is the largest A* heap, or for DFBnB the most
+    states held in the child lists of its stack. heuristic_seconds and
+    deadline_seconds include the timing calls themselves, so read them as
+    relative weights rather than exact costs.
+    """
+    __slots__ = ('expanded', 'generated', 'pruned_bound', 'pruned_deadline', 'pruned_duplicate',
+                 'peak_open', 'heuristic_calls', 'heuristic_seconds', 'deadline_calls',
+                 'deadline_seconds', 'seconds', 'start')
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.pruned_bound = 0
+        self.pruned_deadline = 0
+        self.pruned_duplicate = 0
+        self.peak_open = 0
+        self.heuristic_calls = 0
+        self.heuristic_seconds = 0.0
+        self.deadline_calls = 0
+        self.deadline_seconds = 0.0
+        self.seconds = 0.0
+        self.start = time.perf_counter()
+
+    @property
+    def nodes_per_second(self) -> float:
+        elapsed = self.seconds or time.perf_counter() - self.start
+        return self.expanded / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        stats = {name: getattr(self, name) for name in self.__slots__ if name != 'start'}
+        stats['nodes_per_second'] = self.nodes_per_second
+        return stats
+
+    def __repr__(self):
+        return (f"SearchStats(expanded={self.expanded}, generated={self.generated}, "
+                f"pruned_bound={self.pruned_bound}, pruned_deadline={self.pruned_deadline}, "
+                f"pruned_duplicate={self.pruned_duplicate}, peak_open={self.peak_open}, "
+                f"seconds={self.seconds:.3f})")
+
+
+@contextlib.contextmanager
+def profiled(scheduler, stats: Optional[SearchStats],
+             progress_callback: Optional[Callable[[SearchStats], None]] = None,
+             progress_every: int = DEFAULT_PROGRESS_EVERY):
+    """Collect `stats` for the search run inside the block.
+
+    Counting and timing wrappers shadow the scheduler's expand, heuristic,
+    batch_heuristic (one call per child in the batch), is_dominated and,
+    when some pruner is active, prune_child as instance attributes and are
+    removed on exit, so with stats=None nothing in the search changes.
+    progress_callback(stats) runs every `progress_every` expansions.
+    """
+    if stats is None:
+        yield
+        return
+    clock = time.perf_counter
+    heuristic = scheduler.heuristic
+    batch_heuristic = scheduler.batch_heuristic
+    is_dominated = scheduler.is_dominated
+    expand = scheduler.expand
+    prune_child = scheduler.prune_child
+
+    def timed_heuristic(*args):
+        start = clock()
+        h = heuristic(*args)
+        stats.heuristic_seconds += clock() - start
+        stats.heuristic_calls += 1
+        return h
+
+    def timed_batch_heuristic(new_g, *args):
+        start = clock()
+        lb = batch_heuristic(new_g, *args)
+        stats.heuristic_seconds += clock() - start
+        stats.heuristic_calls += new_g.size
+        return lb
+
+    def timed_prune_child(*args):
+        start = clock()
+        late = prune_child(*args)
+        stats.deadline_seconds += clock() - start
+        stats.deadline_calls += 1
+        if late:
+            stats.pruned_deadline += 1
+        return late
+
+    def counted_is_dominated(closed, state):
+        if is_dominated(closed, state):
+            stats.pruned_duplicate += 1
+            return True
+        return False
+
+    def counted_expand(cur, incumbent):
+        stats.expanded += 1
+        if progress_callback is not None and stats.expanded % progress_every == 0:
+            progress_callback(stats)
+        # every candidate child gets one heuristic call, then is cut by the
+        # bound, cut by the deadline check, or generated
+        calls, late = stats.heuristic_calls, stats.pruned_deadline
+        children = 0
+        for child in expand(cur, incumbent):
+            children += 1
+            yield child
+        stats.generated += children
+        stats.pruned_bound += (stats.heuristic_calls - calls) - (stats.pruned_deadline - late) - children
+
+    scheduler.heuristic = timed_heuristic
+    scheduler.batch_heuristic = timed_batch_heuristic
+    scheduler.is_dominated = counted_is_dominated
+    scheduler.expand = counted_expand
+    if prune_child is not None:
+        scheduler.prune_child = timed_prune_child
+    try:
+        yield
+    finally:
+        del scheduler.heuristic, scheduler.batch_heuristic, scheduler.is_dominated, scheduler.expand
+        scheduler.prune_child = prune_child
+        stats.seconds = clock() - stats.start
@@ -0,0 +1,230 @@
+import hashlib
+import itertools
+import json
+import math
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+import node_pool
+import search_budget
+
+# entries kept before the least recently used are evicted
+DEFAULT_MAX_ENTRIES = 100_000
+# orderings of still-tied bases and colonies tried when canonicalising; past
+# this, ties keep their input order and a relabelled twin may miss the cache
+MAX_TIE_ORDERINGS = 720
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    key TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    makespan REAL,
+    lower_bound REAL NOT NULL,
+    schedule TEXT,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used);
+"""
+
+
+def canonical_number(x):
+    # 7 and 7.0 encode the same
+    x = float(x)
+    return int(x) if x.is_integer() else x
+
+
+def _ranks(signatures: Dict) -> Dict:
+    # label -> rank of its signature among the distinct signatures; ranks only
+    # depend on the signatures, never on the labels
+    order = {sig: i for i, sig in enumerate(sorted(set(signatures.values())))}
+    return {label: order[sig] for label, sig in signatures.items()}
+
+
+class CanonicalForm:
+    """An instance relabelled into a canonical order of bases, colonies, ships and tasks.
+
+    Bases and colonies without tasks (or ship starts) never affect a
+    schedule and are dropped. The rest are ordered by colour refinement over
+    setup times, deadlines, the travel matrix and the tasks between them;
+    colours that stay tied are broken by trying every ordering (up to
+    MAX_TIE_ORDERINGS) and keeping the smallest encoding. Two instances with
+    the same `key` are therefore the same instance up to relabelling.
+    task_order[i] / ship_order[i] are the scheduler's ids of canonical task
+    and ship i.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        jobs = [(b, c, canonical_number(travel)) for b, c, travel in scheduler.jobs]
+        deadline = getattr(scheduler, "deadline", None)
+        bases = sorted({b for b, _, _ in jobs})
+        colons = sorted({c for _, c, _ in jobs} | {c for c in scheduler.start_colons if c != -1})
+        setup = {b: canonical_number(scheduler.setup[b]) for b in bases}
+        dl = {b: canonical_number(deadline[b]) if deadline is not None and b < len(deadline) else -1
+              for b in bases}
+        matrix = {(b, c): canonical_number(scheduler.matrix_time[b][c]) for b in bases for c in colons}
+        travels: Dict[Tuple[int, int], List] = {}
+        for b, c, travel in jobs:
+            travels.setdefault((b, c), []).append(travel)
+        pair = {(b, c): tuple(sorted(travels.get((b, c), ()))) for b in bases for c in colons}
+        starts = [(canonical_number(t), c) for t, c in zip(scheduler.start_times, scheduler.start_colons)]
+
+        base_color = _ranks({b: (setup[b], dl[b], tuple(sorted(t for (pb, _), ts in travels.items()
+                                                                  if pb == b for t in ts)))
+                             for b in bases})
+        colon_color = _ranks({c: (tuple(sorted(t for (_, pc), ts in travels.items() if pc == c for t in ts)),
+                                  sum(1 for _, sc in starts if sc == c))
+                              for c in colons})
+        while True:
+            new_base = _ranks({b: (base_color[b], tuple(sorted((matrix[b, c], colon_color[c], pair[b, c])
+                                                               for c in colons)))
+                               for b in bases})
+            new_colon = _ranks({c: (colon_color[c], tuple(sorted((matrix[b, c], base_color[b], pair[b, c])
+                                                                 for b in bases)))
+                                for c in colons})
+            stable = (len(set(new_base.values())) == len(set(base_color.values()))
+                      and len(set(new_colon.values())) == len(set(colon_color.values())))
+            base_color, colon_color = new_base, new_colon
+            if stable:
+                break
+
+        base_groups = [[b for b in bases if base_color[b] == k] for k in sorted(set(base_color.values()))]
+        colon_groups = [[c for c in colons if colon_color[c] == k] for k in sorted(set(colon_color.values()))]
+        count = 1
+        for group in base_groups + colon_groups:
+            count *= math.factorial(len(group))
+        if count > MAX_TIE_ORDERINGS:
+            choices = [[g] for g in base_groups + colon_groups]
+        else:
+            choices = [list(itertools.permutations(g)) for g in base_groups + colon_groups]
+
+        best = None
+        for pick in itertools.product(*choices):
+            order_b = [b for group in pick[:len(base_groups)] for b in group]
+            order_c = [c for group in pick[len(base_groups):] for c in group]
+            pb = {b: i for i, b in enumerate(order_b)}
+            pc = {c: i for i, c in enumerate(order_c)}
+            pc[-1] = -1
+            encoding = (scheduler.num_ships,
+                        tuple(setup[b] for b in order_b), tuple(dl[b] for b in order_b),
+                        tuple(tuple(matrix[b, c] for c in order_c) for b in order_b),
+                        tuple(sorted((pb[b], pc[c], travel) for b, c, travel in jobs)),
+                        tuple(sorted((t, pc[c]) for t, c in starts)))
+            if best is None or encoding < best[0]:
+                best = (encoding, pb, pc)
+
+        self.encoding, pb, pc = best
+        self.key = hashlib.sha256(json.dumps(self.encoding).encode()).hexdigest()
+        self.task_order = [tid for *_, tid in sorted((pb[b], pc[c], travel, tid)
+                                                     for tid, (b, c, travel) in enumerate(jobs))]
+        self.ship_order = [sh for *_, sh in sorted((t, pc[c], sh) for sh, (t, c) in enumerate(starts))]
+
+    def to_canonical(self, actions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        ship = {sh: i for i, sh in enumerate(self.ship_order)}
+        task = {tid: i for i, tid in enumerate(self.task_order)}
+        return [(ship[sh], task[tid]) for sh, tid in actions]
+
+    def from_canonical(self, actions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        return [(self.ship_order[sh], self.task_order[tid]) for sh, tid in actions]
+
+
+def fingerprint(scheduler) -> str:
+    return CanonicalForm(scheduler).key
+
+
+class SolutionCache:
+    """SQLite store of solved instances, keyed by CanonicalForm.key.
+
+    Each entry holds the search_report status ("optimal", "infeasible" or
+    "budget"), the best makespan and schedule found and the best proven
+    lower bound. At most `max_entries` are kept, evicting the least recently
+    used. Several processes may share one file.
+    """
+
+    def __init__(self, path: str = ":memory:", max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db = sqlite3.connect(path, timeout=30.0)
+        if path != ":memory:":
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self.max_entries = max_entries
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def lookup(self, scheduler, form: Optional[CanonicalForm] = None) -> Optional[Dict]:
+        # the entry for `scheduler`'s instance with its schedule in the
+        # scheduler's own ship and task ids, or None
+        form = form or CanonicalForm(scheduler)
+        row = self.db.execute("SELECT status, makespan, lower_bound, schedule FROM solutions WHERE key = ?",
+                              (form.key,)).fetchone()
+        if row is None:
+            return None
+        with self.db:
+            self.db.execute("UPDATE solutions SET used = ? WHERE key = ?", (time.time(), form.key))
+        status, makespan, lower_bound, schedule = row
+        return {"status": status, "makespan": math.inf if makespan is None else makespan,
+                "lower_bound": lower_bound,
+                "schedule": None if schedule is None else form.from_canonical(json.loads(schedule))}
+
+    def store(self, scheduler, end_state, form: Optional[CanonicalForm] = None):
+        # record scheduler's latest search, keeping the better of it and any
+        # earlier entry on both bounds
+        form = form or CanonicalForm(scheduler)
+        report = scheduler.search_report
+        status, lower = report["status"], report["lower_bound"]
+        makespan, schedule = math.inf, None
+        if end_state is not None:
+            makespan = end_state.g
+            schedule = json.dumps(form.to_canonical(scheduler.reconstruct(end_state)))
+        row = self.db.execute("SELECT status, makespan, lower_bound, schedule FROM solutions WHERE key = ?",
+                              (form.key,)).fetchone()
+        if row is not None and status == "budget":
+            old_makespan = math.inf if row[1] is None else row[1]
+            if row[0] != "budget" or old_makespan <= makespan:
+                status, makespan, schedule = (row[0] if row[0] != "budget" else status), old_makespan, row[3]
+            lower = max(lower, row[2])
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?)",
+                            (form.key, status, None if makespan == math.inf else makespan, lower,
+                             schedule, time.time()))
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self.db.execute("DELETE FROM solutions WHERE key IN "
+                                "(SELECT key FROM solutions ORDER BY used LIMIT ?)", (excess,))
+
+    def search(self, scheduler, **search_kwargs):
+        """scheduler.search() that answers solved instances from the cache.
+
+        An optimal or infeasible entry is replayed on the scheduler without
+        searching; a budget-limited one seeds the new search's incumbent, and
+        the result is stored back. scheduler.cache_hit tells which happened.
+        A scheduler with extra pruners searches without the cache: they
+        change the answer but are not part of the key.
+        """
+        if scheduler.pruners:
+            scheduler.cache_hit = False
+            return scheduler.search(**search_kwargs)
+        form = CanonicalForm(scheduler)
+        entry = self.lookup(scheduler, form)
+        scheduler.cache_hit = False
+        if entry is not None and entry["status"] != "budget":
+            scheduler.node_pool = node_pool.NodePool()
+            state = None if entry["schedule"] is None else scheduler.replay(entry["schedule"])
+            if state is None or state.g == entry["makespan"]:
+                scheduler.cache_hit = True
+                scheduler.search_report = search_budget.search_report(state, None)
+                return state
+        seed = None if entry is None else entry["schedule"]
+        end_state = scheduler.search(seed_actions=seed, **search_kwargs)
+        self.store(scheduler, end_state, form)
+        return end_state
@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import json
+import multiprocessing as mp
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Union
+
+import batch_solver
+from solution_cache import canonical_number
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# results kept by the LRU cache
+DEFAULT_CACHE_SIZE = 1024
+# statuses worth caching; timeouts and errors are retried on the next request
+CACHED_STATUSES = ("ok", "infeasible")
+# bytes a request line may hold; asyncio's default of 64 KiB is too small for large scenarios
+DEFAULT_LINE_LIMIT = 16 * 1024 * 1024
+
+
+def _pool_context():
+    # workers start on demand, and a worker forked from the serving process
+    # would inherit its client sockets and hold closed connections open
+    return mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+
+
+def fingerprint(scenario: Dict) -> str:
+    """Canonical SHA-256 of what decides a scenario's answer.
+
+    Covers num_ships, groups, capacities, to_base, travel_matrix, deadlines
+    and the colony assignment mode. The id, the engine and heuristic_mode
+    (every engine returns an optimal schedule), key order and number
+    formatting are left out, and all -1 deadlines count as none.
+    """
+    deadlines = scenario.get("deadlines")
+    if deadlines is not None and all(d == -1 for d in deadlines):
+        deadlines = None
+    canonical = {
+        "num_ships": int(scenario["num_ships"]),
+        "groups": [int(g) for g in scenario["groups"]],
+        "capacities": [int(c) for c in scenario["capacities"]],
+        "to_base": [canonical_number(t) for t in scenario["to_base"]],
+        "travel_matrix": [[canonical_number(t) for t in row] for row in scenario["travel_matrix"]],
+        "deadlines": None if deadlines is None else [canonical_number(d) for d in deadlines],
+        "assignment": scenario.get("assignment", "greedy"),
+    }
+    text = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+async def _skip_line(reader: asyncio.StreamReader):
+    # drop the rest of an over-limit line, through its newline or the end of stream
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as exc:
+            await reader.readexactly(exc.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class SolverService:
+    """Solves scenarios on a process pool without blocking the event loop.
+
+    Requests whose fingerprints match a solve still in flight wait for that
+    solve instead of starting another, and finished results are kept in an
+    LRU cache of `cache_size` entries. Every answer is a
+    `batch_solver.solve_scenario` record with the requester's id and a
+    `source` of "solved", "coalesced", "cache" or "rejected" (not a valid
+    scenario, or a request line over `line_limit` bytes); `seconds` is the
+    time of the underlying solve. `counts` tallies the sources. A worker
+    that dies fails its solves with an "error" record, and the pool is
+    replaced for later requests.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_size: int = DEFAULT_CACHE_SIZE,
+                 limit: Optional[float] = batch_solver.DEFAULT_TIME_LIMIT,
+                 executor: Optional[concurrent.futures.Executor] = None, cache_path: Optional[str] = None,
+                 line_limit: int = DEFAULT_LINE_LIMIT):
+        self.workers = workers
+        self.executor = executor or self._new_executor()
+        self.cache_size = cache_size
+        self.limit = limit
+        # optional on-disk solution_cache file shared by the workers
+        self.cache_path = cache_path
+        self.line_limit = line_limit
+        self.cache: "collections.OrderedDict[str, Dict]" = collections.OrderedDict()
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.counts = {"solved": 0, "coalesced": 0, "cache": 0, "rejected": 0}
+
+    async def solve(self, scenario: Union[str, Dict], index: int = 0) -> Dict:
+        try:
+            if isinstance(scenario, str):
+                scenario = json.loads(scenario)
+            if not isinstance(scenario, dict):
+                raise ValueError("scenario must be a JSON object")
+            key = fingerprint(scenario)
+        except (ValueError, KeyError, TypeError) as exc:
+            rid = scenario.get("id", index) if isinstance(scenario, dict) else index
+            return self.rejected(rid, f"{type(exc).__name__}: {exc}")
+        rid = scenario.get("id", index)
+
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            source = "cache"
+        else:
+            task = self.in_flight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._run(scenario, index))
+                self.in_flight[key] = task
+                task.add_done_callback(lambda done: self._finished(key, done))
+                source = "solved"
+            else:
+                source = "coalesced"
+            # shielded, so a requester that goes away does not cancel the others' solve
+            result = await asyncio.shield(task)
+        self.counts[source] += 1
+        return dict(result, id=rid, source=source)
+
+    async def _run(self, scenario: Dict, index: int) -> Dict:
+        # A worker that dies breaks the whole pool: the solves it fails get an
+        # error record, and the first to notice swaps in a new pool.
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        args = (batch_solver.solve_scenario, scenario, index, self.limit, self.cache_path)
+        try:
+            try:
+                future = loop.run_in_executor(executor, *args)
+            except BrokenProcessPool:
+                # broken by a crash no solve has reported yet
+                executor = self._renew(executor)
+                future = loop.run_in_executor(executor, *args)
+            return await future
+        except BrokenProcessPool:
+            self._renew(executor)
+            return {"id": index, "status": "error", "reason": "worker process died", "seconds": 0.0}
+        except Exception as exc:
+            return {"id": index, "status": "error", "reason": f"{type(exc).__name__}: {exc}", "seconds": 0.0}
+
+    def _new_executor(self) -> concurrent.futures.Executor:
+        return concurrent.futures.ProcessPoolExecutor(self.workers, mp_context=_pool_context())
+
+    def _renew(self, broken: concurrent.futures.Executor) -> concurrent.futures.Executor:
+        if self.executor is broken:
+            broken.shutdown(wait=False)
+            self.executor = self._new_executor()
+        return self.executor
+
+    def rejected(self, rid, reason: str) -> Dict:
+        self.counts["rejected"] += 1
+        return {"id": rid, "status": "error", "reason": reason, "source": "rejected"}
+
+    def _finished(self, key: str, task: asyncio.Future):
+        del self.in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result["status"] in CACHED_STATUSES and self.cache_size > 0:
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # one JSON scenario per line in, one result per line out, in request
+        # order; the lines of a connection are solved concurrently
+        pending: asyncio.Queue = asyncio.Queue()
+
+        async def respond():
+            while True:
+                task = await pending.get()
+                if task is None:
+                    return
+                writer.write((json.dumps(await task) + "\n").encode())
+                await writer.drain()
+
+        responder = asyncio.ensure_future(respond())
+        index = 0
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as exc:
+                    # end of stream; a last line may lack its newline
+                    line = exc.partial
+                    if not line:
+                        break
+                except asyncio.LimitOverrunError:
+                    await _skip_line(reader)
+                    answer = asyncio.get_running_loop().create_future()
+                    answer.set_result(self.rejected(index,
+                                                    f"request line longer than {self.line_limit} bytes"))
+                    pending.put_nowait(answer)
+                    index += 1
+                    continue
+                if line.strip():
+                    pending.put_nowait(asyncio.ensure_future(self.solve(line.decode(), index)))
+                    index += 1
+            pending.put_nowait(None)
+            await responder
+        finally:
+            responder.cancel()
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, limit=self.line_limit)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(service: SolverService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    server = await service.start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve rescue scenario solves over local TCP (JSON lines).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("-t", "--time-limit", type=float, default=batch_solver.DEFAULT_TIME_LIMIT,
+                        help="seconds per scenario, 0 for none")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--cache", default=None, help="SQLite solution cache file (default: none)")
+    parser.add_argument("--line-limit", type=int, default=DEFAULT_LINE_LIMIT,
+                        help="bytes a request line may hold (default: 16 MiB)")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.workers, args.cache_size, args.time_limit or None, cache_path=args.cache,
+                            line_limit=args.line_limit)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
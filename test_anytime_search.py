@@ -0,0 +1,52 @@
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import colon_assignment
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+class TestAnytimeSearch(unittest.TestCase):
+    def assert_stream(self, scheduler, expected):
+        results = list(scheduler.anytime_search())
+        self.assertTrue(results, "anytime_search yielded nothing")
+        makespans = [state.g for state, _ in results]
+        self.assertEqual(makespans, sorted(makespans, reverse=True))
+        for state, lower_bound in results:
+            self.assertLessEqual(lower_bound, state.g)
+            schedule = scheduler.reconstruct(state)
+            self.assertEqual(sorted(tid for _, tid in schedule), list(range(scheduler.num_tasks)))
+        final_state, final_bound = results[-1]
+        self.assertEqual(expected, int(final_state.g))
+        self.assertEqual(final_state.g, final_bound)
+
+    def test_standard_stream_ends_optimal(self):
+        travel_matrix = [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3, 4], [4, 4, 1, 4], travel_matrix)
+        scheduler = standard.Scheduler(4, tasks, [7, 4, 9, 2], matrix_time=travel_matrix)
+        self.assert_stream(scheduler, 24)
+
+    def test_deadline_stream_ends_optimal(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], [-1, -1, 10], travel_matrix)
+        self.assert_stream(scheduler, 34)
+
+    def test_weights_must_end_with_one(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        for weights in ((3.0, 1.5), ()):
+            with self.assertRaises(ValueError):
+                scheduler.anytime_search(weights)
+        self.assertEqual(23, int(list(scheduler.anytime_search((2.0, 1.0)))[-1][0].g))
+
+    def test_first_schedule_is_the_initial_incumbent(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = standard.Scheduler(3, tasks, [7, 4, 9], matrix_time=travel_matrix)
+        first_state, _ = next(scheduler.anytime_search())
+        self.assertEqual(scheduler.incumbent_report["improved"], first_state.g)
+        self.assertLessEqual(first_state.g, scheduler.greedy_initial_solution())
+
+
+if __name__ == '__main__':
+    unittest.main()
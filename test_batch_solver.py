@@ -0,0 +1,83 @@
+import io
+import json
+import multiprocessing as mp
+import os
+import signal
+import unittest
+import unittest.mock
+
+import batch_solver
+
+STANDARD = {"num_ships": 3, "groups": [1, 3, 3], "capacities": [4, 4, 1], "to_base": [7, 4, 9],
+            "travel_matrix": [[6, 7, 8], [10, 9, 2], [6, 3, 7]]}
+
+SOLVE_SCENARIO = batch_solver.solve_scenario
+
+
+def crash_on_kill(scenario, index=0, limit=None, cache_path=None):
+    # kills its own worker process for the scenario with id "kill"
+    if isinstance(scenario, dict) and scenario.get("id") == "kill":
+        os.kill(os.getpid(), signal.SIGKILL)
+    return SOLVE_SCENARIO(scenario, index, limit, cache_path)
+
+
+class TestBatchSolver(unittest.TestCase):
+    def test_results_in_input_order(self):
+        lines = [json.dumps(dict(STANDARD, id="a")),
+                 "not json",
+                 "",
+                 json.dumps(dict(STANDARD, id="b", deadlines=[-1, -1, 10])),
+                 json.dumps(dict(STANDARD, id="c", deadlines=[-1, -1, 1])),
+                 json.dumps(dict(STANDARD, id="d", groups=[1, 3]))]
+        results = list(batch_solver.solve_batch(lines, workers=2))
+        self.assertEqual(["a", 1, "b", "c", "d"], [r["id"] for r in results])
+        self.assertEqual(["ok", "error", "ok", "infeasible", "error"], [r["status"] for r in results])
+        self.assertEqual(23, results[0]["makespan"])
+        self.assertEqual(34, results[2]["makespan"])
+        self.assertEqual(sorted(t for _, t in results[0]["schedule"]), list(range(7)))
+
+    def test_input_is_read_lazily(self):
+        read = []
+
+        def scenarios():
+            for i in range(20):
+                read.append(i)
+                yield dict(STANDARD, id=i)
+
+        results = batch_solver.solve_batch(scenarios(), workers=2)
+        self.assertEqual(0, next(results)["id"])
+        self.assertLessEqual(len(read), batch_solver.IN_FLIGHT_PER_WORKER * 2)
+        self.assertEqual(list(range(1, 20)), [r["id"] for r in results])
+        self.assertEqual(20, len(read))
+
+    def test_timeout_does_not_stall(self):
+        # 15 distinct tasks on 3 ships: far beyond the limit
+        big = {"id": "big", "num_ships": 3, "groups": [3, 3, 3, 3, 3], "capacities": [1] * 15,
+               "to_base": [7, 4, 9, 5, 8],
+               "travel_matrix": [[(3 + 7 * b + 5 * c) % 11 + 2 for c in range(15)] for b in range(5)]}
+        results = list(batch_solver.solve_batch([big, dict(STANDARD, id="small")],
+                                                workers=1, limit=0.2))
+        self.assertEqual("timeout", results[0]["status"])
+        self.assertEqual("ok", results[1]["status"])
+
+    @unittest.skipUnless(mp.get_start_method() == "fork", "the patched solver reaches workers by fork")
+    def test_dead_worker_yields_an_error(self):
+        scenarios = [dict(STANDARD, id=i) for i in range(3)] + [dict(STANDARD, id="kill")]
+        scenarios += [dict(STANDARD, id=i) for i in range(3, 8)]
+        with unittest.mock.patch("batch_solver.solve_scenario", crash_on_kill):
+            results = list(batch_solver.solve_batch(scenarios, workers=2))
+        self.assertEqual([0, 1, 2, "kill", 3, 4, 5, 6, 7], [r["id"] for r in results])
+        self.assertEqual(["error"], [r["status"] for r in results if r["status"] != "ok"])
+        self.assertEqual("worker process died", results[3]["reason"])
+
+    def test_cli_writes_jsonl(self):
+        out = io.StringIO()
+        src = io.StringIO(json.dumps(STANDARD) + "\n")
+        with unittest.mock.patch("sys.stdin", src), unittest.mock.patch("sys.stdout", out):
+            self.assertEqual(0, batch_solver.main(["-w", "1"]))
+        result = json.loads(out.getvalue())
+        self.assertEqual(("ok", 23), (result["status"], result["makespan"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
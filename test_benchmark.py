@@ -0,0 +1,50 @@
+import time
+import unittest
+import unittest.mock
+
+import batch_solver
+import benchmark
+import instance_generator
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_report_and_compare(self):
+        sizes = [("tiny", dict(num_ships=2, num_bases=2, num_colons=2, num_groups=4))]
+        results = benchmark.run_suite(sizes, seeds=(0, 1), limit=None)
+        self.assertEqual(4, len(results))
+        for record in results:
+            self.assertEqual("ok", record["status"])
+            self.assertGreater(record["expanded"], 0)
+            self.assertGreater(record["peak_memory_bytes"], 0)
+        report = benchmark.build_report(results, None, benchmark.DEFAULT_TIGHTNESS)
+        rows = benchmark.compare(report, report)
+        self.assertEqual(4, len(rows))
+        self.assertTrue(all(row["expanded"] == 1.0 for row in rows))
+
+    def test_sizes_after_all_timeouts_are_skipped(self):
+        sizes = [("big", dict(num_ships=3, num_bases=5, num_colons=15, num_groups=15, capacity_slack=1.0)),
+                 ("bigger", dict(num_ships=3, num_bases=5, num_colons=16, num_groups=16))]
+        results = benchmark.run_suite(sizes, seeds=(0,), variants=("standard",), limit=0.05, memory=False)
+        self.assertEqual(["timeout", "skipped"], [r["status"] for r in results])
+
+    def test_traced_run_keeps_the_time_limit(self):
+        build = batch_solver.build_scheduler
+        calls = []
+
+        def slow_second_build(scenario):
+            # the traced run's scheduler takes longer than the limit to build
+            calls.append(scenario)
+            if len(calls) == 2:
+                time.sleep(1.0)
+            return build(scenario)
+
+        scenario = instance_generator.generate_scenario(0, num_ships=2, num_bases=2, num_colons=2, num_groups=4)
+        with unittest.mock.patch("batch_solver.build_scheduler", slow_second_build):
+            record = benchmark.run_case(scenario, limit=0.2)
+        self.assertEqual(2, len(calls))
+        self.assertEqual("ok", record["status"])
+        self.assertIsNone(record["peak_memory_bytes"])
+
+
+if __name__ == '__main__':
+    unittest.main()
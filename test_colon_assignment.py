@@ -0,0 +1,59 @@
+import random
+import unittest
+
+import Standard_rescue_operations as standard
+import colon_assignment
+
+
+def per_group_scan(groups, capacities, travel_matrix):
+    caps = capacities.copy()
+    tasks = []
+    for b in range(len(groups)):
+        for _ in range(groups[b]):
+            best_colon = standard.give_best_colon_for_base(caps, len(caps), b, travel_matrix)
+            tasks.append((b, best_colon, travel_matrix[b][best_colon]))
+            caps[best_colon] -= 1
+    return tasks
+
+
+class TestColonAssignment(unittest.TestCase):
+    def test_greedy_matches_per_group_scan(self):
+        rng = random.Random(12)
+        for _ in range(200):
+            num_bases, num_colons = rng.randint(1, 5), rng.randint(1, 5)
+            travel_matrix = [[rng.randint(0, 6) for _ in range(num_colons)] for _ in range(num_bases)]
+            capacities = [rng.randint(0, 4) for _ in range(num_colons)]
+            groups = [rng.randint(0, 3) for _ in range(num_bases)]
+            if sum(groups) > sum(capacities):
+                with self.assertRaises(Exception):
+                    colon_assignment.assign_tasks(groups, capacities, travel_matrix)
+                continue
+            self.assertEqual(per_group_scan(groups, capacities, travel_matrix),
+                             colon_assignment.assign_tasks(groups, capacities, travel_matrix))
+
+    def test_min_cost_flow_is_globally_cheaper(self):
+        # greedy sends base 0 to colon 0 and base 1 pays 9 for colon 1
+        travel_matrix = [[1, 2], [1, 9]]
+        greedy = colon_assignment.assign_tasks([1, 1], [1, 1], travel_matrix)
+        flow = colon_assignment.assign_tasks([1, 1], [1, 1], travel_matrix, mode="min_cost_flow")
+        self.assertEqual([(0, 0, 1), (1, 1, 9)], greedy)
+        self.assertEqual([(0, 1, 2), (1, 0, 1)], flow)
+
+    def test_min_cost_flow_respects_groups_and_capacities(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        groups, capacities = [1, 3, 3], [4, 4, 1]
+        flow = colon_assignment.assign_tasks(groups, capacities, travel_matrix, mode="min_cost_flow")
+        greedy = colon_assignment.assign_tasks(groups, capacities, travel_matrix)
+        self.assertEqual(groups, [sum(1 for b, _, _ in flow if b == base) for base in range(3)])
+        for c, cap in enumerate(capacities):
+            self.assertLessEqual(sum(1 for _, col, _ in flow if col == c), cap)
+        self.assertTrue(all(travel_matrix[b][c] == t for b, c, t in flow))
+        self.assertLessEqual(sum(t for _, _, t in flow), sum(t for _, _, t in greedy))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            colon_assignment.assign_tasks([1], [1], [[1]], mode="optimal")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import contextlib
+import io
+import itertools
+import random
+import unittest
+
+import DeadLine_Standard_rescue_operations as deadline
+import colon_assignment
+import batch_solver
+import instance_generator
+from transposition_table import TranspositionTable
+
+
+def exhaustive_makespan(num_ships, tasks, to_base, deadlines, travel_matrix):
+    # every task order and ship assignment; inf when none boards every task in time
+    best = float("inf")
+    for order in itertools.permutations(range(len(tasks))):
+        for ships in itertools.product(range(num_ships), repeat=len(tasks)):
+            times = [0.0] * num_ships
+            prev = [-1] * num_ships
+            for tid, sh in zip(order, ships):
+                b, c, travel = tasks[tid]
+                boarding = times[sh] + (to_base[b] if prev[sh] == -1 else travel_matrix[b][prev[sh]])
+                if deadlines[b] != -1 and boarding > deadlines[b]:
+                    break
+                times[sh] = boarding + travel
+                prev[sh] = c
+            else:
+                best = min(best, max(times))
+    return best
+
+
+def random_instance(rng):
+    num_ships = rng.choice([1, 2, 2, 3])
+    travel_matrix = [[rng.randint(1, 9) for _ in range(2)] for _ in range(2)]
+    tasks = []
+    for _ in range(rng.randint(2, 5 if num_ships < 3 else 4)):
+        b, c = rng.randrange(2), rng.randrange(2)
+        tasks.append((b, c, rng.choice([travel_matrix[b][c], rng.randint(1, 9)])))
+    to_base = [rng.randint(1, 9) for _ in range(2)]
+    deadlines = [rng.choice([-1, rng.randint(3, 25)]) for _ in range(2)]
+    return num_ships, tasks, to_base, deadlines, travel_matrix
+
+
+class TestDeadlineSearch(unittest.TestCase):
+    def makespan(self, instance, **kwargs):
+        scheduler = deadline.Scheduler(*instance, **kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            end_state = scheduler.search()
+        return float("inf") if end_state is None else end_state.g
+
+    def test_job_classes_map_back_to_task_ids(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        deadlines = [-1, -1, 10]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], deadlines, travel_matrix)
+        with contextlib.redirect_stdout(io.StringIO()):
+            end_state = scheduler.search()
+        self.assertIsNotNone(end_state)
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+        for tid, (b, _, _) in enumerate(tasks):
+            if deadlines[b] != -1:
+                self.assertLessEqual(end_state.task_boarding_times[tid], deadlines[b])
+
+    def test_dominated_state_is_pruned(self):
+        scheduler = deadline.Scheduler(2, [(0, 0, 1), (1, 1, 1)], [2, 3], [5, -1], [[1, 2], [2, 1]])
+        closed = TranspositionTable()
+        early = deadline.State(times=(3.0, 0.0), tasks_done=1, g=3.0, f=3.0, ship_prev_colons=(0, -1),
+                               base_boarding=(2.0, 0.0))
+        late = deadline.State(times=(0.0, 4.0), tasks_done=1, g=4.0, f=4.0, ship_prev_colons=(-1, 0),
+                              base_boarding=(3.0, 0.0))
+        self.assertFalse(scheduler.is_dominated(closed, early))
+        self.assertTrue(scheduler.is_dominated(closed, late))
+        self.assertTrue(scheduler.is_dominated(closed, early))
+
+    def test_partial_order_keeps_tight_deadline_optima(self):
+        instance = (2, [(1, 1, 1), (0, 1, 5), (0, 1, 5), (0, 0, 6), (1, 1, 1), (1, 0, 6)], [2, 9], [21, 13],
+                    [[6, 5], [6, 1]])
+        self.assertEqual(18, self.makespan(instance, partial_order=True))
+        self.assertEqual(18, self.makespan(instance, partial_order=False))
+
+    def test_partial_order_keeps_makespans(self):
+        scenarios = [
+            (3, [1, 3, 3], [4, 4, 1], [7, 4, 9], [-1, -1, 10], [[6, 7, 8], [10, 9, 2], [6, 3, 7]], 34),
+            (3, [1, 1, 1, 1, 1], [2, 2, 1], [2, 1, 2, 1, 2], [-1, -1, -1, -1, -1],
+             [[1, 3, 4], [2, 1, 3], [3, 2, 1], [1, 2, 2], [2, 1, 1]], 4),
+            (4, [1, 3, 3, 4], [4, 4, 1, 4], [7, 4, 9, 2], [-1, -1, -1, -1],
+             [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]], 24),
+        ]
+        for num_ships, base, capacities, to_base, deadlines, travel_matrix, expected in scenarios:
+            tasks = colon_assignment.assign_tasks(base, capacities, travel_matrix)
+            for partial_order in (False, True):
+                scheduler = deadline.Scheduler(num_ships, tasks, to_base, deadlines, travel_matrix,
+                                               partial_order=partial_order)
+                end_state = scheduler.search()
+                self.assertIsNotNone(end_state)
+                self.assertEqual(expected, int(end_state.g), f"partial_order={partial_order}")
+                for tid, (b, _, _) in enumerate(tasks):
+                    if deadlines[b] != -1:
+                        self.assertLessEqual(end_state.task_boarding_times[tid], deadlines[b])
+
+    def test_partial_order_keeps_generated_tight_deadline_makespans(self):
+        size = dict(num_ships=3, num_bases=3, num_colons=3, num_groups=7, deadline_share=1.0)
+        for seed in range(12):
+            scenario = instance_generator.generate_scenario(seed, deadline_tightness=(0.6, 0.8, 1.0)[seed % 3],
+                                                            **size)
+            makespans = []
+            for partial_order in (False, True):
+                scheduler = batch_solver.build_scheduler(scenario)
+                scheduler.partial_order = partial_order
+                with contextlib.redirect_stdout(io.StringIO()):
+                    end_state = scheduler.search()
+                makespans.append(None if end_state is None else end_state.g)
+            self.assertEqual(makespans[0], makespans[1], f"seed={seed}")
+
+    def test_competing_bases_fail_initial_check(self):
+        # each base alone fits its deadline, but one ship cannot board both by 3
+        instance = (1, [(0, 0, 2), (1, 1, 2)], [1, 1], [3, 3], [[2, 2], [2, 2]])
+        scheduler = deadline.Scheduler(*instance)
+        scheduler.deadline_windows = [w for w in scheduler.deadline_windows if len(w[1]) == 1]
+        self.assertTrue(scheduler.check_deadlines_feasible_initial()[0])
+        ok, msg = deadline.Scheduler(*instance).check_deadlines_feasible_initial()
+        self.assertFalse(ok)
+        self.assertIn("Bases [0, 1]", msg)
+        self.assertEqual(float("inf"), self.makespan(instance))
+
+    def test_deadline_windows_prune_and_keep_makespans(self):
+        size = dict(num_ships=3, num_bases=4, num_colons=4, num_groups=12, deadline_share=0.75)
+        for seed, tightness in ((0, 0.6), (3, 0.8), (5, 1.0)):
+            scenario = instance_generator.generate_scenario(seed, deadline_tightness=tightness, **size)
+            runs = []
+            for windows in (False, True):
+                scheduler = batch_solver.build_scheduler(scenario)
+                if not windows:
+                    scheduler.deadline_windows = []
+                with contextlib.redirect_stdout(io.StringIO()):
+                    end_state = scheduler.search(stats=True)
+                runs.append((None if end_state is None else end_state.g, scheduler.stats.expanded))
+            self.assertEqual(runs[0][0], runs[1][0])
+            self.assertLess(runs[1][1], runs[0][1])
+
+    def test_pruning_matches_exhaustive_search(self):
+        rng = random.Random(7)
+        infeasible = 0
+        for _ in range(150):
+            instance = random_instance(rng)
+            expected = exhaustive_makespan(*instance)
+            infeasible += expected == float("inf")
+            for partial_order in (True, False):
+                for mode in deadline.HEURISTIC_MODES:
+                    self.assertEqual(expected, self.makespan(instance, partial_order=partial_order,
+                                                             heuristic_mode=mode),
+                                     f"{instance} partial_order={partial_order} mode={mode}")
+        # the draw covers both outcomes
+        self.assertGreater(infeasible, 0)
+        self.assertLess(infeasible, 150)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import unittest.mock
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import colon_assignment
+import node_pool
+
+
+class PeakPool(node_pool.NodePool):
+    # node pool that remembers its largest size
+    __slots__ = ('peak',)
+
+    def add(self, parent, action):
+        node = super().add(parent, action)
+        self.peak = max(getattr(self, 'peak', 0), len(self))
+        return node
+
+
+class TestDepthFirstBranchAndBound(unittest.TestCase):
+    def test_standard_matches_astar(self):
+        travel_matrix = [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3, 4], [4, 4, 1, 4], travel_matrix)
+        scheduler = standard.Scheduler(4, tasks, [7, 4, 9, 2], matrix_time=travel_matrix)
+        end_state = scheduler.search(engine="dfbnb")
+        self.assertIsNotNone(end_state)
+        self.assertEqual(24, int(end_state.g))
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+
+    def test_node_pool_bounded_by_depth(self):
+        travel_matrix = [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3, 4], [4, 4, 1, 4], travel_matrix)
+        scheduler = standard.Scheduler(4, tasks, [7, 4, 9, 2], matrix_time=travel_matrix)
+        with unittest.mock.patch("node_pool.NodePool", PeakPool):
+            end_state = scheduler.search(engine="dfbnb", stats=True)
+        # the replayed incumbent plus one path of tasks and ship closings
+        depth = len(tasks) + scheduler.num_ships + 1
+        self.assertLessEqual(scheduler.node_pool.peak, 2 * depth)
+        self.assertGreater(scheduler.stats.expanded, 10 * depth)
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(24, int(end_state.g))
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+
+    def test_small_table_still_optimal(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = standard.Scheduler(3, tasks, [7, 4, 9], matrix_time=travel_matrix)
+        end_state = scheduler.search(engine="dfbnb", table_size=16)
+        self.assertIsNotNone(end_state)
+        self.assertEqual(23, int(end_state.g))
+
+    def test_deadline_matches_astar(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], [-1, -1, 10], travel_matrix)
+        end_state = scheduler.search(engine="dfbnb")
+        self.assertIsNotNone(end_state)
+        self.assertEqual(34, int(end_state.g))
+
+    def test_deadline_infeasible_returns_none(self):
+        travel_matrix = [[2, 2], [2, 2]]
+        tasks = [(0, 0, 2), (1, 1, 2)]
+        scheduler = deadline.Scheduler(1, tasks, [1, 1], [3, 3], travel_matrix)
+        self.assertIsNone(scheduler.search(engine="dfbnb"))
+
+    def test_unknown_engine_rejected(self):
+        scheduler = standard.Scheduler(1, [(0, 0, 1)], [1], matrix_time=[[1]])
+        with self.assertRaises(ValueError):
+            scheduler.search(engine="bfs")
+
+
+if __name__ == '__main__':
+    unittest.main()
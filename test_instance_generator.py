@@ -0,0 +1,32 @@
+import unittest
+
+import batch_solver
+import instance_generator
+
+
+class TestInstanceGenerator(unittest.TestCase):
+    def test_seeded_and_well_formed(self):
+        for structure in instance_generator.MATRIX_STRUCTURES:
+            a = instance_generator.generate_scenario(7, num_ships=2, num_bases=4, num_colons=3,
+                                                     num_groups=9, matrix=structure)
+            self.assertEqual(a, instance_generator.generate_scenario(
+                7, num_ships=2, num_bases=4, num_colons=3, num_groups=9, matrix=structure))
+            self.assertEqual(9, sum(a["groups"]))
+            self.assertTrue(all(g >= 1 for g in a["groups"]))
+            self.assertGreaterEqual(sum(a["capacities"]), 9)
+            self.assertEqual((4, 3), (len(a["travel_matrix"]), len(a["travel_matrix"][0])))
+            self.assertNotIn("deadlines", a)
+        self.assertNotEqual(instance_generator.generate_scenario(1), instance_generator.generate_scenario(2))
+        with self.assertRaises(ValueError):
+            instance_generator.generate_scenario(0, matrix="spiral")
+
+    def test_loose_deadlines_are_feasible(self):
+        for seed in range(10):
+            scenario = instance_generator.generate_scenario(seed, num_groups=8, deadline_tightness=1.0)
+            self.assertTrue(any(d != -1 for d in scenario["deadlines"]))
+            result = batch_solver.solve_scenario(scenario, limit=None)
+            self.assertEqual("ok", result["status"], result)
+
+
+if __name__ == '__main__':
+    unittest.main()
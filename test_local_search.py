@@ -0,0 +1,48 @@
+import math
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import colon_assignment
+import local_search
+
+
+class TestLocalSearch(unittest.TestCase):
+    def test_improves_greedy_incumbent(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = standard.Scheduler(3, tasks, [7, 4, 9], matrix_time=travel_matrix)
+        makespan, actions = scheduler.initial_incumbent()
+        report = scheduler.incumbent_report
+        self.assertEqual(30, report["greedy"])
+        self.assertEqual(25, report["improved"])
+        self.assertEqual(makespan, scheduler.replay(actions).g)
+        self.assertEqual(sorted(tid for _, tid in actions), list(range(len(tasks))))
+
+    def test_result_never_worse_than_start(self):
+        travel_matrix = [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3, 4], [4, 4, 1, 4], travel_matrix)
+        scheduler = standard.Scheduler(2, tasks, [7, 4, 9, 2], matrix_time=travel_matrix)
+        greedy, actions = scheduler.greedy_initial_schedule()
+        makespan, improved = local_search.improve(scheduler, actions)
+        self.assertLessEqual(makespan, greedy)
+        self.assertGreaterEqual(makespan, scheduler.search(improve_incumbent=False).g)
+
+    def test_repairs_missed_deadline(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], [-1, 16, 16], travel_matrix)
+        makespan, actions = scheduler.initial_incumbent()
+        self.assertEqual(math.inf, scheduler.incumbent_report["greedy"])
+        self.assertNotEqual(math.inf, makespan)
+        self.assertEqual(makespan, scheduler.replay(actions).g)
+
+    def test_search_result_unchanged(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], [-1, -1, 10], travel_matrix)
+        self.assertEqual(scheduler.search(improve_incumbent=False).g, scheduler.search().g)
+
+
+if __name__ == '__main__':
+    unittest.main()
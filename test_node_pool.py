@@ -0,0 +1,49 @@
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+from node_pool import NodePool, ROOT
+
+
+class TestNodePool(unittest.TestCase):
+    def test_path_follows_parents(self):
+        pool = NodePool()
+        root = pool.add(ROOT, None)
+        a = pool.add(root, (0, 3))
+        b = pool.add(a, (1, None))
+        c = pool.add(b, (1, 2))
+        pool.add(a, (2, 5))
+        self.assertEqual([(0, 3), (1, None), (1, 2)], pool.path(c))
+        self.assertEqual([(0, 3), (1, None), (1, 2), (0, 4)], pool.actions(c, (0, 4)))
+        self.assertEqual([], pool.actions(ROOT, None))
+        self.assertEqual(5, len(pool))
+
+    def test_graft_prepends_prefix(self):
+        pool = NodePool()
+        grafted = pool.graft(((0, 1), (1, 0)))
+        node = pool.add(grafted, None)
+        self.assertEqual([(0, 1), (1, 0), (2, 2)], pool.actions(node, (2, 2)))
+
+    def test_states_hold_no_parent_reference(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = [(0, 0, 6), (1, 2, 2), (1, 1, 9), (2, 1, 3)]
+        scheduler = standard.Scheduler(2, tasks, [7, 4, 9], matrix_time=travel_matrix)
+        end_state = scheduler.search()
+        self.assertIsInstance(end_state.parent, int)
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+        self.assertEqual(end_state.g, scheduler.replay(schedule).g)
+
+    def test_deadline_boarding_times_rebuilt_from_log(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = [(0, 0, 6), (1, 2, 2), (1, 1, 9), (2, 1, 3)]
+        scheduler = deadline.Scheduler(2, tasks, [7, 4, 9], [-1, -1, 12], travel_matrix)
+        end_state = scheduler.search()
+        self.assertEqual(len(tasks), len(end_state.task_boarding_times))
+        self.assertLessEqual(end_state.task_boarding_times[3], 12)
+        self.assertEqual(end_state.task_boarding_times,
+                         scheduler.replay(scheduler.reconstruct(end_state)).task_boarding_times)
+
+
+if __name__ == '__main__':
+    unittest.main()
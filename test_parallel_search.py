@@ -0,0 +1,41 @@
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import colon_assignment
+
+
+class TestParallelSearch(unittest.TestCase):
+    def test_standard_matches_serial(self):
+        travel_matrix = [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]]
+        tasks = colon_assignment.assign_tasks([1, 1, 1, 4], [1, 4, 1, 4], travel_matrix)
+        scheduler = standard.Scheduler(4, tasks, [3, 4, 9, 2], matrix_time=travel_matrix)
+        end_state = scheduler.search(workers=2)
+        self.assertIsNotNone(end_state)
+        self.assertEqual(20, int(end_state.g))
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+
+    def test_deadline_matches_serial(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], [-1, -1, 10], travel_matrix)
+        end_state = scheduler.search(workers=2)
+        self.assertIsNotNone(end_state)
+        self.assertEqual(34, int(end_state.g))
+        for tid, (b, _, _) in enumerate(tasks):
+            if b == 2:
+                self.assertLessEqual(end_state.task_boarding_times[tid], 10)
+
+    def test_infeasible_deadline_returns_none(self):
+        # passes the initial checks, but the ship's way back from either colony
+        # to the other base is too long to serve both in time
+        travel_matrix = [[1, 5], [5, 1]]
+        tasks = [(0, 0, 1), (1, 1, 1)]
+        scheduler = deadline.Scheduler(1, tasks, [1, 1], [3, 3], travel_matrix)
+        self.assertTrue(scheduler.check_deadlines_feasible_initial()[0])
+        self.assertIsNone(scheduler.search(workers=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
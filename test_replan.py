@@ -0,0 +1,71 @@
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import replan
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+class TestReplan(unittest.TestCase):
+    def solve(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        end_state = scheduler.search()
+        return scheduler, scheduler.reconstruct(end_state)
+
+    def test_start_state(self):
+        scheduler = standard.Scheduler(2, [(0, 1, 8)], [7, 4, 9], TRAVEL_MATRIX,
+                                       ship_times=[5, 1], ship_colons=[2, -1])
+        # ship 0 is 8 from base 0 at colon 2 and would arrive at 21; ship 1 launches at 1
+        self.assertEqual(16, int(scheduler.search().g))
+        self.assertEqual((5.0, 1.0), scheduler.initial_state().times)
+
+    def test_start_colonies_count_for_inbound_bounds(self):
+        # only the ships' start colony 2 is 1 from base 0; no job ends there
+        for mode in standard.HEURISTIC_MODES:
+            scheduler = standard.Scheduler(2, [(0, 0, 5), (0, 0, 5)], [50], [[50, 50, 1]], heuristic_mode=mode,
+                                           ship_times=[0, 0], ship_colons=[2, 2])
+            self.assertEqual(6, int(scheduler.search().g), mode)
+            scheduler = deadline.Scheduler(2, [(0, 0, 5), (0, 0, 5)], [50], [-1], [[50, 50, 1]],
+                                           heuristic_mode=mode, ship_times=[0, 0], ship_colons=[2, 2])
+            self.assertEqual(6, int(scheduler.search().g), mode)
+
+    def test_late_ship_does_not_fail_the_deadline_check(self):
+        scheduler = deadline.Scheduler(2, [(0, 0, 1)], [2], [5], [[3]], ship_times=[0, 100], ship_colons=[-1, -1])
+        self.assertTrue(scheduler.check_deadlines_feasible_initial()[0])
+        self.assertEqual(2.0, scheduler.search().task_boarding_times[0])
+
+    def test_unchanged_plan_keeps_its_makespan(self):
+        scheduler, plan = self.solve()
+        new, end_state, task_ids = replan.replan(scheduler, plan, plan[:3])
+        self.assertEqual(23, int(end_state.g))
+        self.assertEqual(23, new.replan_report["seed"])
+        self.assertEqual(sorted(tid for _, tid in plan[3:]), task_ids)
+
+    def test_delay_and_new_task_match_a_cold_solve(self):
+        scheduler, plan = self.solve()
+        new, end_state, task_ids = replan.replan(scheduler, plan, plan[:2], delays={1: 4},
+                                                 added_tasks=[(2, 1, 3)], removed_tasks=[plan[-1][1]])
+        self.assertEqual(len(TASKS) - 2, len(task_ids))
+        self.assertIsNone(task_ids[-1])
+        self.assertEqual(sorted(tid for _, tid in new.reconstruct(end_state)), list(range(new.num_tasks)))
+        cold = new.restarted(new.jobs, new.start_times, new.start_colons)
+        self.assertEqual(cold.search().g, end_state.g)
+
+    def test_deadlines_hold_after_a_delay(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 30], TRAVEL_MATRIX)
+        plan = scheduler.reconstruct(scheduler.search())
+        new, end_state, task_ids = replan.replan(scheduler, plan, plan[:2], delays={0: 3, 1: 3, 2: 3})
+        self.assertIsNotNone(end_state)
+        for tid, boarding in enumerate(end_state.task_boarding_times):
+            if new.jobs[tid][0] == 2:
+                self.assertLessEqual(boarding, 30)
+
+    def test_nothing_left(self):
+        scheduler, plan = self.solve()
+        new, end_state, task_ids = replan.replan(scheduler, plan, plan)
+        self.assertEqual([], task_ids)
+        self.assertEqual(23, int(end_state.g))
+
+
+if __name__ == '__main__':
+    unittest.main()
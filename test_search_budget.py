@@ -0,0 +1,63 @@
+import math
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import batch_solver
+import instance_generator
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+# 16 tasks on 4 ships: about 20 s to prove optimal
+HARD = instance_generator.generate_scenario(2, num_ships=4, num_bases=5, num_colons=5, num_groups=16)
+
+
+class TestSearchBudget(unittest.TestCase):
+    def assertValidSchedule(self, scheduler, end_state):
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(scheduler.jobs))))
+        self.assertEqual(end_state.g, scheduler.replay(schedule).g)
+
+    def test_unbounded_search_reports_optimal(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        self.assertEqual(23, int(scheduler.search().g))
+        self.assertEqual({"status": "optimal", "reason": None, "upper_bound": 23.0,
+                          "lower_bound": 23.0, "gap": 0.0}, scheduler.search_report)
+
+    def test_node_budget_returns_incumbent(self):
+        for engine in ("astar", "dfbnb"):
+            scheduler = batch_solver.build_scheduler(HARD)
+            end_state = scheduler.search(engine=engine, node_budget=200)
+            report = scheduler.search_report
+            self.assertEqual(("budget", "nodes"), (report["status"], report["reason"]))
+            self.assertEqual(end_state.g, report["upper_bound"])
+            self.assertLessEqual(report["lower_bound"], report["upper_bound"])
+            self.assertGreaterEqual(report["lower_bound"], scheduler.initial_state().f)
+            self.assertTrue(0.0 <= report["gap"] < 1.0)
+            self.assertValidSchedule(scheduler, end_state)
+
+    def test_time_and_memory_budgets(self):
+        scheduler = batch_solver.build_scheduler(HARD)
+        end_state = scheduler.search(time_budget=0.3)
+        self.assertEqual("time", scheduler.search_report["reason"])
+        self.assertValidSchedule(scheduler, end_state)
+        scheduler = batch_solver.build_scheduler(dict(HARD, deadlines=[-1, 40, -1, -1, 40]))
+        end_state = scheduler.search(memory_budget=2 ** 20)
+        self.assertEqual("memory", scheduler.search_report["reason"])
+        self.assertEqual(16, len(end_state.task_boarding_times))
+
+    def test_no_fallback_without_feasible_incumbent(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, 16, 16], TRAVEL_MATRIX)
+        self.assertIsNone(scheduler.search(improve_incumbent=False, node_budget=1))
+        report = scheduler.search_report
+        self.assertEqual(("budget", math.inf, math.inf), (report["status"], report["upper_bound"], report["gap"]))
+        self.assertLessEqual(report["lower_bound"], 29)
+
+    def test_budgets_need_a_single_worker(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        with self.assertRaises(ValueError):
+            scheduler.search(workers=2, time_budget=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
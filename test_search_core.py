@@ -0,0 +1,99 @@
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import search_core
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+class FinishBy(search_core.Pruner):
+    # every ship must be done by `limit`
+    def __init__(self, limit):
+        self.limit = limit
+
+    def check_root(self, scheduler):
+        late = max(scheduler.start_times) > self.limit
+        return not late, f"a ship starts after {self.limit}" if late else ""
+
+    def prune_child(self, scheduler, counts, served, open_times, base_boarding):
+        return bool(open_times) and open_times[-1] > self.limit
+
+
+class ChildrenOnly(search_core.Pruner):
+    # prunes every child but passes incumbents
+    checks_incumbent = False
+
+    def prune_child(self, scheduler, counts, served, open_times, base_boarding):
+        return True
+
+
+class TestSearchCore(unittest.TestCase):
+    def test_inactive_deadlines_compile_to_nothing(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, -1], TRAVEL_MATRIX)
+        self.assertIsNone(scheduler.prune_child)
+        self.assertEqual(23, int(scheduler.search(stats=True).g))
+        self.assertEqual(0, scheduler.stats.deadline_calls)
+        self.assertIsNone(standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX).prune_child)
+
+    def test_active_deadlines_are_one_stage(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX)
+        self.assertEqual(1, len(scheduler.pipeline.stages))
+        self.assertIsInstance(scheduler.pipeline.stages[0], search_core.DeadlinePruner)
+        self.assertEqual(29, int(scheduler.search(stats=True).g))
+        self.assertGreater(scheduler.stats.pruned_deadline, 0)
+
+    def test_extra_pruner_in_standard_module(self):
+        for limit, makespan in ((23, 23), (22, None)):
+            scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, pruners=[FinishBy(limit)])
+            end_state = scheduler.search()
+            self.assertEqual(makespan, None if end_state is None else int(end_state.g))
+        late = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, ship_times=[0, 0, 30],
+                                  pruners=[FinishBy(23)])
+        self.assertIsNone(late.search())
+        self.assertEqual("infeasible", late.search_report["status"])
+
+    def test_extra_pruner_runs_after_deadlines(self):
+        for engine in search_core.SEARCH_ENGINES:
+            scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX,
+                                           pruners=[FinishBy(28)])
+            self.assertEqual(2, len(scheduler.pipeline.stages))
+            self.assertIsNone(scheduler.search(engine=engine))
+            scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX,
+                                           pruners=[FinishBy(29)])
+            self.assertEqual(29, int(scheduler.search(engine=engine).g))
+
+    def test_restarted_keeps_the_pruners(self):
+        pruner = FinishBy(40)
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, pruners=[pruner])
+        self.assertEqual((pruner,), scheduler.restarted(TASKS[1:], [1, 2, 3], [-1, 0, 1]).pruners)
+
+    def test_admits_follows_the_schedule(self):
+        makespan, actions = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX).initial_incumbent()
+        for limit in (makespan - 1, makespan):
+            scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, pruners=[FinishBy(limit)])
+            self.assertEqual(limit >= makespan, scheduler.pipeline.admits(scheduler, actions))
+
+    def test_deadlines_do_not_check_the_incumbent(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX)
+        self.assertEqual((), scheduler.pipeline.incumbent_stages)
+        makespan, actions = search_core.initial_incumbent(scheduler)
+        self.assertEqual(scheduler.initial_incumbent(), (makespan, actions))
+
+    def test_drained_heap_returns_the_incumbent(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, pruners=[ChildrenOnly()])
+        makespan, actions = scheduler.initial_incumbent()
+        end_state = scheduler.search()
+        self.assertEqual(makespan, end_state.g)
+        self.assertEqual(actions, scheduler.reconstruct(end_state))
+
+    def test_both_schedulers_share_the_base(self):
+        plain = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX)
+        timed = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, -1], TRAVEL_MATRIX)
+        for scheduler in (plain, timed):
+            self.assertIsInstance(scheduler, search_core.SchedulerBase)
+            self.assertIsInstance(scheduler.initial_state(), search_core.State)
+        self.assertEqual(plain.search().g, timed.search().g)
+
+
+if __name__ == '__main__':
+    unittest.main()
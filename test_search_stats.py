@@ -0,0 +1,55 @@
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_disabled_by_default(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        self.assertEqual(23, int(scheduler.search().g))
+        self.assertIsNone(scheduler.stats)
+        self.assertNotIn("heuristic", vars(scheduler))
+
+    def test_standard_counts(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        end_state = scheduler.search(stats=True)
+        self.assertEqual(23, int(end_state.g))
+        stats = scheduler.stats
+        self.assertGreater(stats.expanded, 0)
+        self.assertGreaterEqual(stats.peak_open, 1)
+        self.assertEqual(0, stats.pruned_deadline)
+        self.assertEqual(stats.heuristic_calls, stats.generated + stats.pruned_bound)
+        self.assertGreater(stats.nodes_per_second, 0)
+        self.assertNotIn("expand", vars(scheduler))
+
+    def test_deadline_prunes_counted(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX)
+        end_state = scheduler.search(stats=True)
+        self.assertEqual(29, int(end_state.g))
+        stats = scheduler.stats
+        self.assertGreater(stats.pruned_deadline, 0)
+        self.assertGreater(stats.deadline_calls, 0)
+        self.assertEqual(stats.deadline_calls, stats.generated + stats.pruned_deadline)
+        self.assertIn("pruned_duplicate", stats.as_dict())
+
+    def test_dfbnb_tracks_its_stack(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        self.assertEqual(23, int(scheduler.search(engine="dfbnb", stats=True).g))
+        self.assertGreater(scheduler.stats.peak_open, 1)
+        self.assertLessEqual(scheduler.stats.peak_open, scheduler.stats.generated + 1)
+        list(scheduler.anytime_search())
+        self.assertIsNone(scheduler.stats)
+
+    def test_progress_callback(self):
+        seen = []
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], matrix_time=TRAVEL_MATRIX)
+        end_state = scheduler.search(engine="dfbnb", progress_callback=lambda s: seen.append(s.expanded),
+                                     progress_every=5)
+        self.assertEqual(23, int(end_state.g))
+        self.assertEqual(list(range(5, scheduler.stats.expanded + 1, 5)), seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
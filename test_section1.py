@@ -1,3 +1,4 @@
+import math
 import unittest
 from typing import List, Tuple
 from Standard_rescue_operations import give_best_colon_for_base, Scheduler
@@ -123,6 +124,95 @@ class TestSection1Manual(unittest.TestCase):
         self.assertIsNotNone(end_state, "No schedule found for test_case_7")
         self.assertEqual(20, int(end_state.g), msg=f"Expected 20, got {end_state.g}")
 
+    def test_case_8_job_classes_map_back_to_task_ids(self):
+        num_ships, num_bases, num_colons, base, capacities, to_base, travel_matrix = (
+        4, 4, 4, [1, 3, 3, 4], [4, 4, 1, 4], [7, 4, 9, 2],
+        [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]])
+
+        caps = capacities.copy()
+        tasks: List[Tuple[int, int, int]] = []
+        for b in range(num_bases):
+            for _ in range(base[b]):
+                best_colon = give_best_colon_for_base(caps, num_colons, b, travel_matrix)
+                tasks.append((b, best_colon, travel_matrix[b][best_colon]))
+                caps[best_colon] -= 1
+        scheduler = Scheduler(num_ships, tasks, to_base, matrix_time=travel_matrix)
+        self.assertLess(scheduler.num_classes, len(tasks))
+        end_state = scheduler.search()
+        self.assertIsNotNone(end_state, "No schedule found for test_case_8")
+        schedule = scheduler.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+
+    def test_case_9_heuristic_modes_agree(self):
+        num_ships, num_bases, num_colons, base, capacities, to_base, travel_matrix = (
+        4, 4, 4, [1, 1, 1, 4], [1, 4, 1, 4], [3, 4, 9, 2],
+        [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]])
+
+        caps = capacities.copy()
+        tasks: List[Tuple[int, int, int]] = []
+        for b in range(num_bases):
+            for _ in range(base[b]):
+                best_colon = give_best_colon_for_base(caps, num_colons, b, travel_matrix)
+                tasks.append((b, best_colon, travel_matrix[b][best_colon]))
+                caps[best_colon] -= 1
+        for mode in ("basic", "inbound", "tight"):
+            scheduler = Scheduler(num_ships, tasks, to_base, matrix_time=travel_matrix, heuristic_mode=mode)
+            end_state = scheduler.search()
+            self.assertIsNotNone(end_state, f"No schedule found with heuristic_mode={mode}")
+            self.assertEqual(20, int(end_state.g), msg=f"Expected 20 with {mode}, got {end_state.g}")
+        with self.assertRaises(ValueError):
+            Scheduler(num_ships, tasks, to_base, matrix_time=travel_matrix, heuristic_mode="nope")
+
+    def test_case_10_idle_ships_expand_once(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = [(0, 0, 6), (1, 2, 2), (2, 1, 3)]
+        scheduler = Scheduler(4, tasks, [7, 4, 9], matrix_time=travel_matrix, partial_order=False)
+        root = scheduler.initial_state()
+        children = list(scheduler.expand(root, math.inf))
+        self.assertEqual(len(tasks), len(children))
+        self.assertEqual([0, 2], scheduler.distinct_ships((5.0, 5.0, 3.0, 5.0), (1, 1, 1, 1)))
+        self.assertEqual(13, int(scheduler.search().g))
+
+    def test_case_11_partial_order_keeps_makespans(self):
+        scenarios = [
+            (3, [1, 3, 3], [4, 4, 1], [7, 4, 9], [[6, 7, 8], [10, 9, 2], [6, 3, 7]], 23),
+            (2, [1, 1], [1, 1], [2, 3], [[3, 1], [2, 2]], 5),
+            (3, [1, 1, 1], [1, 1, 1], [4, 2, 3], [[1, 2, 3], [2, 1, 1], [3, 2, 1]], 5),
+            (4, [1, 3, 3, 4], [4, 4, 1, 4], [7, 4, 9, 2],
+             [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]], 24),
+            (4, [1, 1, 1, 4], [1, 4, 1, 4], [3, 4, 9, 2],
+             [[6, 7, 8, 3], [10, 9, 2, 4], [6, 3, 7, 5], [6, 7, 8, 9]], 20),
+        ]
+        for num_ships, base, capacities, to_base, travel_matrix, expected in scenarios:
+            caps = capacities.copy()
+            tasks: List[Tuple[int, int, int]] = []
+            for b in range(len(base)):
+                for _ in range(base[b]):
+                    best_colon = give_best_colon_for_base(caps, len(caps), b, travel_matrix)
+                    tasks.append((b, best_colon, travel_matrix[b][best_colon]))
+                    caps[best_colon] -= 1
+            for partial_order in (False, True):
+                scheduler = Scheduler(num_ships, tasks, to_base, matrix_time=travel_matrix,
+                                      partial_order=partial_order)
+                end_state = scheduler.search()
+                self.assertEqual(expected, int(end_state.g), msg=f"partial_order={partial_order}")
+                schedule = scheduler.reconstruct(end_state)
+                self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(tasks))))
+        scheduler = Scheduler(4, [(0, 0, 6), (1, 2, 2)], [7, 4], matrix_time=[[6, 7, 8], [10, 9, 2]])
+        root_children = list(scheduler.expand(scheduler.initial_state(), math.inf))
+        # one child per job class for ship 0, plus closing ship 0
+        self.assertEqual([(0, 0), (0, 1), (0, None)], [child.action for child in root_children])
+
+    def test_case_12_tight_bound_on_non_metric_matrix(self):
+        # matrix_time breaks the triangle inequality: a detour via another job's
+        # colony reaches base 3 sooner than any ship's direct return does
+        tasks = [(0, 3, 2), (0, 0, 6), (1, 0, 1), (1, 3, 5), (2, 0, 3), (2, 1, 5), (2, 0, 3),
+                 (3, 1, 9), (3, 3, 7), (3, 1, 9)]
+        travel_matrix = [[6, 9, 7, 2], [1, 1, 5, 5], [3, 5, 4, 4], [2, 9, 4, 7]]
+        for mode in ("basic", "tight"):
+            scheduler = Scheduler(4, tasks, [9, 2, 3, 6], matrix_time=travel_matrix, heuristic_mode=mode)
+            self.assertEqual(19, int(scheduler.search(improve_incumbent=False).g), msg=mode)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import batch_solver
+import search_core
+import solution_cache
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+# bases 0 <-> 2 swapped, colonies moved 0 -> 2 -> 1 -> 0, task order reversed
+BASES = [2, 1, 0]
+COLONS = [2, 0, 1]
+RELABELLED = [(BASES[b], COLONS[c], t) for b, c, t in reversed(TASKS)]
+RELABELLED_MATRIX = [[0] * 3 for _ in range(3)]
+for b in range(3):
+    for c in range(3):
+        RELABELLED_MATRIX[BASES[b]][COLONS[c]] = TRAVEL_MATRIX[b][c]
+STANDARD = {"num_ships": 3, "groups": [1, 3, 3], "capacities": [4, 4, 1], "to_base": [7, 4, 9],
+            "travel_matrix": TRAVEL_MATRIX}
+
+
+class TestSolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = solution_cache.SolutionCache()
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_relabelled_instance_hits(self):
+        first = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX)
+        self.assertEqual(23, int(self.cache.search(first).g))
+        self.assertFalse(first.cache_hit)
+        twin = standard.Scheduler(3, RELABELLED, [9, 4, 7], RELABELLED_MATRIX)
+        self.assertEqual(solution_cache.fingerprint(first), solution_cache.fingerprint(twin))
+        end_state = self.cache.search(twin)
+        self.assertTrue(twin.cache_hit)
+        self.assertEqual(23, int(end_state.g))
+        schedule = twin.reconstruct(end_state)
+        self.assertEqual(sorted(tid for _, tid in schedule), list(range(len(RELABELLED))))
+        self.assertEqual("optimal", twin.search_report["status"])
+
+    def test_different_instances_miss(self):
+        key = solution_cache.fingerprint(standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX))
+        for other in (standard.Scheduler(2, TASKS, [7, 4, 9], TRAVEL_MATRIX),
+                      standard.Scheduler(3, TASKS, [7, 4, 8], TRAVEL_MATRIX),
+                      deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 20], TRAVEL_MATRIX),
+                      standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, ship_times=[0, 0, 1])):
+            self.assertNotEqual(key, solution_cache.fingerprint(other))
+        no_deadlines = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, -1], TRAVEL_MATRIX)
+        self.assertEqual(key, solution_cache.fingerprint(no_deadlines))
+
+    def test_extra_pruners_bypass_the_cache(self):
+        class FinishBy22(search_core.Pruner):
+            # no ship may finish after 22, one short of the optimum
+            def prune_child(self, scheduler, counts, served, open_times, base_boarding):
+                return bool(open_times) and open_times[-1] > 22
+
+        self.assertEqual(23, int(self.cache.search(standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX)).g))
+        pruned = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, pruners=[FinishBy22()])
+        self.assertIsNone(self.cache.search(pruned))
+        self.assertFalse(pruned.cache_hit)
+        self.assertEqual(1, len(self.cache))
+
+    def test_deadline_entries_keep_boarding_times(self):
+        scheduler = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX)
+        self.cache.search(scheduler)
+        twin = deadline.Scheduler(3, RELABELLED, [9, 4, 7], [16, -1, -1], RELABELLED_MATRIX)
+        end_state = self.cache.search(twin)
+        self.assertTrue(twin.cache_hit)
+        self.assertEqual(29, int(end_state.g))
+        self.assertEqual(len(RELABELLED), len(end_state.task_boarding_times))
+        infeasible = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, 10, 10], TRAVEL_MATRIX)
+        self.assertIsNone(self.cache.search(infeasible, improve_incumbent=False))
+        again = deadline.Scheduler(3, TASKS, [7, 4, 9], [-1, 10, 10], TRAVEL_MATRIX)
+        self.assertIsNone(self.cache.search(again))
+        self.assertTrue(again.cache_hit)
+
+    def test_budget_entry_is_improved(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX)
+        self.cache.search(scheduler, improve_incumbent=False, node_budget=1)
+        entry = self.cache.lookup(scheduler)
+        self.assertEqual("budget", entry["status"])
+        self.assertLess(entry["lower_bound"], entry["makespan"])
+        # a budget entry seeds the next search instead of answering it
+        self.cache.search(scheduler)
+        self.assertFalse(scheduler.cache_hit)
+        self.assertEqual(("optimal", 23), (self.cache.lookup(scheduler)["status"],
+                                           self.cache.lookup(scheduler)["makespan"]))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.max_entries = 2
+        schedulers = [standard.Scheduler(n, TASKS, [7, 4, 9], TRAVEL_MATRIX) for n in (1, 2, 3)]
+        self.cache.search(schedulers[0])
+        self.cache.search(schedulers[1])
+        self.cache.lookup(schedulers[0])
+        self.cache.search(schedulers[2])
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.lookup(schedulers[1]))
+        self.assertIsNotNone(self.cache.lookup(schedulers[0]))
+
+    def test_batch_solver_persists_across_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "solutions.db")
+            line = json.dumps(STANDARD)
+            first = batch_solver.solve_scenario(line, 0, None, cache_path=path)
+            second = batch_solver.solve_scenario(line, 1, None, cache_path=path)
+        self.assertEqual((False, True), (first["cache_hit"], second["cache_hit"]))
+        self.assertEqual(first["makespan"], second["makespan"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import signal
+import unittest
+import unittest.mock
+
+import batch_solver
+import solver_service
+
+STANDARD = {"num_ships": 3, "groups": [1, 3, 3], "capacities": [4, 4, 1], "to_base": [7, 4, 9],
+            "travel_matrix": [[6, 7, 8], [10, 9, 2], [6, 3, 7]]}
+
+SOLVE_SCENARIO = batch_solver.solve_scenario
+
+
+def crash_on_kill(scenario, index=0, limit=None, cache_path=None):
+    # kills its own worker process for the scenario with id "kill"
+    if scenario.get("id") == "kill":
+        os.kill(os.getpid(), signal.SIGKILL)
+    return SOLVE_SCENARIO(scenario, index, limit, cache_path)
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_ignores_what_does_not_change_the_answer(self):
+        same = dict(reversed(list(STANDARD.items())), id="x", engine="dfbnb", to_base=[7.0, 4, 9],
+                    deadlines=[-1, -1, -1])
+        self.assertEqual(solver_service.fingerprint(STANDARD), solver_service.fingerprint(same))
+
+    def test_differs_on_the_instance(self):
+        key = solver_service.fingerprint(STANDARD)
+        for change in ({"num_ships": 2}, {"deadlines": [-1, -1, 10]}, {"to_base": [7, 4, 8]},
+                       {"assignment": "min_cost_flow"}):
+            self.assertNotEqual(key, solver_service.fingerprint(dict(STANDARD, **change)))
+
+
+class TestSolverService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = solver_service.SolverService(workers=2, cache_size=2)
+
+    def tearDown(self):
+        self.service.close()
+
+    async def test_identical_requests_are_coalesced_then_cached(self):
+        requests = [dict(STANDARD, id=i) for i in range(4)]
+        results = await asyncio.gather(*(self.service.solve(r) for r in requests))
+        self.assertEqual([0, 1, 2, 3], [r["id"] for r in results])
+        self.assertEqual({23}, {r["makespan"] for r in results})
+        self.assertEqual(["solved", "coalesced", "coalesced", "coalesced"], [r["source"] for r in results])
+        again = await self.service.solve(json.dumps(dict(STANDARD, id="again")))
+        self.assertEqual(("again", "cache", 23), (again["id"], again["source"], again["makespan"]))
+        self.assertEqual({"solved": 1, "coalesced": 3, "cache": 1, "rejected": 0}, self.service.counts)
+
+    async def test_lru_eviction(self):
+        first = dict(STANDARD, deadlines=[-1, -1, 10])
+        await self.service.solve(first)
+        await self.service.solve(dict(STANDARD, num_ships=2))
+        self.assertEqual("cache", (await self.service.solve(first))["source"])
+        await self.service.solve(dict(STANDARD, num_ships=1))
+        self.assertEqual("solved", (await self.service.solve(dict(STANDARD, num_ships=2)))["source"])
+        self.assertEqual(2, len(self.service.cache))
+
+    async def test_errors_are_not_cached(self):
+        bad = dict(STANDARD, groups=[1, 3])
+        self.assertEqual("error", (await self.service.solve(bad))["status"])
+        self.assertEqual("solved", (await self.service.solve(bad))["source"])
+        rejected = await self.service.solve("not json", 5)
+        self.assertEqual((5, "error", "rejected"), (rejected["id"], rejected["status"], rejected["source"]))
+
+    async def test_dead_worker_answers_and_pool_recovers(self):
+        with unittest.mock.patch("batch_solver.solve_scenario", crash_on_kill):
+            lost = await self.service.solve(dict(STANDARD, id="kill", num_ships=2))
+            self.assertEqual(("kill", "error", "worker process died"),
+                             (lost["id"], lost["status"], lost["reason"]))
+            after = await self.service.solve(dict(STANDARD, id="after"))
+        self.assertEqual(("after", "ok", 23), (after["id"], after["status"], after["makespan"]))
+        self.assertNotIn(solver_service.fingerprint(dict(STANDARD, num_ships=2)), self.service.cache)
+
+    async def round_trip(self, lines):
+        server = await self.service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection(solver_service.DEFAULT_HOST, port)
+            for line in lines:
+                writer.write(((line if isinstance(line, str) else json.dumps(line)) + "\n").encode())
+            writer.write_eof()
+            results = [json.loads(line) async for line in reader]
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+        return results
+
+    async def test_tcp_round_trip(self):
+        results = await self.round_trip([dict(STANDARD, id="a"), "{}",
+                                         dict(STANDARD, id="b", deadlines=[-1, -1, 1])])
+        self.assertEqual(["a", 1, "b"], [r["id"] for r in results])
+        self.assertEqual(["ok", "error", "infeasible"], [r["status"] for r in results])
+
+    async def test_large_requests(self):
+        # well past asyncio's default 64 KiB line limit
+        results = await self.round_trip([dict(STANDARD, id="big", note="x" * 200000)])
+        self.assertEqual([("big", "ok")], [(r["id"], r["status"]) for r in results])
+        self.service.line_limit = 1024
+        results = await self.round_trip([dict(STANDARD, id="a"), dict(STANDARD, note="x" * 5000),
+                                         dict(STANDARD, note="x" * 200000), dict(STANDARD, id="b")])
+        self.assertEqual(["a", 1, 2, "b"], [r["id"] for r in results])
+        self.assertEqual(["ok", "error", "error", "ok"], [r["status"] for r in results])
+        self.assertEqual(["rejected", "rejected"], [r["source"] for r in results[1:3]])
+        self.assertIn("1024 bytes", results[1]["reason"])
+
+if __name__ == '__main__':
+    unittest.main()
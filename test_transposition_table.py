@@ -0,0 +1,85 @@
+import math
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import colon_assignment
+from transposition_table import TranspositionTable, PROBE_LIMIT
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_counts_hits_and_misses(self):
+        table = TranspositionTable()
+        self.assertIsNone(table.get(42))
+        table.put(42, 3.0)
+        table.put(42, 2.0)
+        self.assertEqual(2.0, table.get(42))
+        self.assertEqual(1, len(table))
+        self.assertEqual({"hits": 1, "misses": 1, "evictions": 0}, {
+            k: v for k, v in table.stats().items() if k in ("hits", "misses", "evictions")})
+
+    def test_grows_without_losing_entries(self):
+        table = TranspositionTable(max_entries=1 << 16)
+        for key in range(5000):
+            table.put(key * 7919, key)
+        self.assertEqual(5000, len(table))
+        self.assertEqual(0, table.stats()["evictions"])
+        self.assertTrue(all(table.get(key * 7919) == key for key in range(5000)))
+
+    def test_full_table_evicts_least_hit(self):
+        table = TranspositionTable(max_entries=PROBE_LIMIT)
+        for key in range(PROBE_LIMIT):
+            table.put(key, key)
+        for key in range(1, PROBE_LIMIT):
+            table.get(key)
+        table.put(PROBE_LIMIT, "new")
+        self.assertEqual(1, table.stats()["evictions"])
+        self.assertIsNone(table.get(0))
+        self.assertEqual("new", table.get(PROBE_LIMIT))
+        self.assertTrue(all(table.get(key) == key for key in range(1, PROBE_LIMIT)))
+
+    def test_value_sizes_count_against_the_cap(self):
+        table = TranspositionTable(max_bytes=64 * 1024)
+        for key in range(5000):
+            table.put(key * 7919, [key], 200)
+        self.assertLessEqual(table.nbytes(), 64 * 1024)
+        self.assertGreater(table.stats()["evictions"], 0)
+        self.assertEqual(200 * len(table), table.value_bytes)
+        # the sweep's deletions leave every remaining key reachable
+        stored = [(k, v) for k, v in zip(table.keys, table.values) if v is not None]
+        self.assertEqual(len(table), len(stored))
+        self.assertTrue(all(table.get(k) is v for k, v in stored))
+
+    def test_hash_follows_moves_and_ignores_ship_order(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        schedulers = [standard.Scheduler(3, tasks, [7, 4, 9], matrix_time=travel_matrix),
+                      deadline.Scheduler(3, tasks, [7, 4, 9], [-1, 20, -1], travel_matrix)]
+        for scheduler in schedulers:
+            frontier = [scheduler.initial_state()]
+            for _ in range(200):
+                cur = frontier.pop(0)
+                for child in scheduler.expand(cur, math.inf):
+                    incremental, child.key_hash = child.key_hash, None
+                    self.assertEqual(incremental, scheduler.key_hash(child))
+                    frontier.append(child)
+        sched = schedulers[0]
+        self.assertEqual(sched.state_hash(1, (3.0, 5.0, 0.0), (0, 2, -1), 0b010),
+                         sched.state_hash(1, (5.0, 0.0, 3.0), (2, -1, 0), 0b001))
+
+    def test_small_table_keeps_makespans(self):
+        travel_matrix = [[6, 7, 8], [10, 9, 2], [6, 3, 7]]
+        tasks = colon_assignment.assign_tasks([1, 3, 3], [4, 4, 1], travel_matrix)
+        scheduler = standard.Scheduler(3, tasks, [7, 4, 9], matrix_time=travel_matrix,
+                                       partial_order=False, table_bytes=1024)
+        self.assertEqual(23, int(scheduler.search().g))
+        self.assertGreater(scheduler.closed_table.stats()["evictions"], 0)
+        scheduler = deadline.Scheduler(3, tasks, [7, 4, 9], [-1, -1, 20], travel_matrix,
+                                       partial_order=False, table_bytes=1024)
+        self.assertEqual(23, int(scheduler.search().g))
+        self.assertGreater(scheduler.closed_table.stats()["evictions"], 0)
+        self.assertLessEqual(scheduler.closed_table.nbytes(), 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import math
+import unittest
+
+import Standard_rescue_operations as standard
+import DeadLine_Standard_rescue_operations as deadline
+import instance_generator
+import batch_solver
+import vector_expansion
+from sample_instances import TASKS, TRAVEL_MATRIX
+
+
+@unittest.skipUnless(vector_expansion.available(), "numpy is not installed")
+class TestVectorExpansion(unittest.TestCase):
+    def assertSameSearch(self, make):
+        runs = []
+        for vectorized in (False, True):
+            scheduler = make(vectorized)
+            end_state = scheduler.search(stats=True)
+            stats = scheduler.stats.as_dict()
+            runs.append((end_state.g, scheduler.reconstruct(end_state),
+                         [stats[name] for name in ("expanded", "generated", "pruned_bound",
+                                                   "pruned_deadline", "heuristic_calls")]))
+        self.assertEqual(runs[0], runs[1])
+
+    def test_standard_matches_scalar(self):
+        for mode in standard.HEURISTIC_MODES:
+            for partial_order in (True, False):
+                self.assertSameSearch(lambda v: standard.Scheduler(
+                    3, TASKS, [7, 4, 9], TRAVEL_MATRIX, heuristic_mode=mode,
+                    partial_order=partial_order, vectorized=v))
+
+    def test_deadline_matches_scalar(self):
+        for mode in deadline.HEURISTIC_MODES:
+            for partial_order in (True, False):
+                self.assertSameSearch(lambda v: deadline.Scheduler(
+                    3, TASKS, [7, 4, 9], [-1, -1, 16], TRAVEL_MATRIX, heuristic_mode=mode,
+                    partial_order=partial_order, vectorized=v))
+
+    def test_children_match_scalar(self):
+        scenario = instance_generator.generate_scenario(1, num_ships=4, num_bases=4, num_colons=5,
+                                                        num_groups=12, deadline_tightness=1.0)
+        scheduler = batch_solver.build_scheduler(dict(scenario, heuristic_mode="tight"))
+        scheduler.service_table = vector_expansion.ServiceTable(scheduler)
+        state = scheduler.replay([(0, 0), (1, 5), (2, 9)])
+        counts = scheduler.done_counts(state.tasks_done)
+        ships = list(range(scheduler.num_ships))
+        for incumbent in (math.inf, state.f + 3):
+            scalar = list(scheduler.expand_ships(state, incumbent, counts, ships, 0))
+            batched = list(scheduler.expand_ships_vectorized(state, incumbent, counts, ships, 0))
+            self.assertEqual([(s.action, s.times, s.g, s.f, s.base_boarding, s.key_hash) for s in scalar],
+                             [(s.action, s.times, s.g, s.f, s.base_boarding, s.key_hash) for s in batched])
+
+    def test_restarted_keeps_the_flag(self):
+        scheduler = standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, vectorized=True)
+        self.assertTrue(scheduler.restarted(TASKS[1:], [1, 2, 3], [-1, 0, 1]).vectorized)
+
+
+@unittest.skipIf(vector_expansion.available(), "numpy is installed")
+class TestWithoutNumpy(unittest.TestCase):
+    def test_vectorized_needs_numpy(self):
+        with self.assertRaises(ImportError):
+            standard.Scheduler(3, TASKS, [7, 4, 9], TRAVEL_MATRIX, vectorized=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import random
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+# default memory cap of a closed-set table, in bytes
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+# rough footprint of one slot: key, hit count and size columns, the value pointer
+# and a share of a small value (a float g); larger values report their own size
+SLOT_BYTES = 48
+# slots a table starts with; it doubles until the cap is reached
+INITIAL_SLOTS = 1024
+# slots probed from a key's home slot before the table evicts
+PROBE_LIMIT = 16
+
+MASK64 = (1 << 64) - 1
+# fixed so every process (e.g. HDA* workers) hashes a state the same way
+ZOBRIST_SEED = 0x5EED
+
+
+def zobrist_keys(sizes: Iterable[int], seed: int = ZOBRIST_SEED) -> List[List[int]]:
+    # one list of random 64-bit keys per entry of `sizes`
+    rng = random.Random(seed)
+    return [[rng.getrandbits(64) for _ in range(size)] for size in sizes]
+
+
+def mix64(x: int) -> int:
+    # splitmix64 finaliser: spreads any int over 64 well-mixed bits
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class TranspositionTable:
+    """Closed set keyed by 64-bit state hashes, with a memory cap.
+
+    Keys, hit counts and values live in flat columns with linear probing. The
+    table doubles while it is more than half full, or when a key finds the
+    PROBE_LIMIT slots from its home slot all taken, until it reaches
+    `max_bytes` (or `max_entries` slots, rounded down to a power of two).
+    From then on a full probe window evicts its least-hit entry, so states
+    that keep being reached stay in. A value that holds more than a slot's
+    share (a dominance list) is put with its size in bytes, and while the
+    columns plus those sizes exceed `max_bytes` a clock sweep evicts entries
+    not hit since it last passed. Evicting only costs pruning: a forgotten
+    state may be expanded again. Keys are trusted without the full state; at
+    64 bits a collision is vanishingly unlikely for the table sizes reached
+    here.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: Optional[int] = None):
+        limit = max(max_entries if max_entries is not None else max_bytes // SLOT_BYTES, PROBE_LIMIT)
+        # power-of-two slot counts, so the home slot is the key's low bits
+        self.max_slots = 1 << limit.bit_length() - 1
+        self.max_bytes = max_bytes
+        # bytes the values report beyond their slots, and the clock sweep's position
+        self.value_bytes = 0
+        self.hand = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._allocate(min(INITIAL_SLOTS, self.max_slots))
+
+    def _allocate(self, slots: int):
+        self.mask = slots - 1
+        self.keys = array('Q', bytes(8 * slots))
+        self.counts = array('I', bytes(4 * slots))
+        self.sizes = array('I', bytes(4 * slots))
+        self.values = [None] * slots
+
+    def __len__(self):
+        return self.size
+
+    def get(self, key: int):
+        keys, values, mask = self.keys, self.values, self.mask
+        i = key & mask
+        for _ in range(PROBE_LIMIT):
+            value = values[i]
+            if value is None:
+                break
+            if keys[i] == key:
+                self.hits += 1
+                if self.counts[i] < 0xFFFFFFFF:
+                    self.counts[i] += 1
+                return value
+            i = (i + 1) & mask
+        self.misses += 1
+        return None
+
+    def put(self, key: int, value, nbytes: int = 0) -> None:
+        # nbytes: what `value` holds beyond its slot; put a value again after
+        # changing it in place to update its size
+        if self.size * 2 >= self.mask and self.mask + 1 < self.max_slots:
+            self._grow()
+        # below the cap a full probe window grows the table instead of evicting
+        while not self._insert(key, value, 0, self.mask + 1 >= self.max_slots, nbytes):
+            self._grow()
+        if self.value_bytes and self.nbytes() > self.max_bytes:
+            self._sweep(key)
+
+    def _insert(self, key: int, value, count: int, evict: bool = True, nbytes: int = 0) -> bool:
+        keys, values, counts, mask = self.keys, self.values, self.counts, self.mask
+        i = key & mask
+        victim = i
+        for _ in range(PROBE_LIMIT):
+            if values[i] is None:
+                self.size += 1
+                break
+            if keys[i] == key:
+                values[i] = value
+                self.value_bytes += nbytes - self.sizes[i]
+                self.sizes[i] = nbytes
+                return True
+            if counts[i] < counts[victim]:
+                victim = i
+            i = (i + 1) & mask
+        else:
+            if not evict:
+                return False
+            self.evictions += 1
+            self.value_bytes -= self.sizes[victim]
+            i = victim
+        keys[i], values[i], counts[i] = key, value, count
+        self.value_bytes += nbytes
+        self.sizes[i] = nbytes
+        return True
+
+    def _sweep(self, keep: int):
+        # clock eviction down to max_bytes: an entry hit since the hand last
+        # passed has its count halved and stays; `keep` (just put) goes last
+        keys, values, counts, mask = self.keys, self.values, self.counts, self.mask
+        while self.size and self.nbytes() > self.max_bytes:
+            i = self.hand = (self.hand + 1) & mask
+            if values[i] is None or (keys[i] == keep and self.size > 1):
+                continue
+            if counts[i]:
+                counts[i] >>= 1
+                continue
+            self.evictions += 1
+            self._delete(i)
+
+    def _delete(self, i: int):
+        # backward-shift deletion: later entries of the probe run move up so
+        # every key stays reachable from its home slot without tombstones
+        keys, values, counts, sizes, mask = self.keys, self.values, self.counts, self.sizes, self.mask
+        self.size -= 1
+        self.value_bytes -= sizes[i]
+        j = i
+        while True:
+            j = (j + 1) & mask
+            if values[j] is None:
+                break
+            # entries whose home slot lies cyclically in (i, j] stay put
+            if (j - (keys[j] & mask)) & mask >= (j - i) & mask:
+                keys[i], values[i], counts[i], sizes[i] = keys[j], values[j], counts[j], sizes[j]
+                i = j
+        values[i] = None
+        sizes[i] = 0
+
+    def _grow(self):
+        old = [(k, v, c, n) for k, v, c, n in zip(self.keys, self.values, self.counts, self.sizes)
+               if v is not None]
+        self._allocate(2 * (self.mask + 1))
+        self.size = 0
+        self.value_bytes = 0
+        # the most hit entries go in first and so sit nearest their home slots
+        old.sort(key=lambda e: -e[2])
+        for key, value, count, nbytes in old:
+            self._insert(key, value, count, True, nbytes)
+
+    def nbytes(self) -> int:
+        # the key, count, size and value-pointer columns plus the sizes values reported
+        columns = self.keys.itemsize + self.counts.itemsize + self.sizes.itemsize + 8
+        return (self.mask + 1) * columns + self.value_bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": self.size, "capacity": self.max_slots, "bytes": self.nbytes()}
@@ -0,0 +1,56 @@
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only Scheduler(..., vectorized=True) needs it
+    np = None
+
+
+def available() -> bool:
+    return np is not None
+
+
+class ServiceTable:
+    """Per job class and previous colon, the arrays the batched expansion reads.
+
+    Column p + 1 of `boarding` is the time from colon p to the class's base;
+    column 0 is the setup from Texas, i.e. previous colon -1.
+    """
+
+    def __init__(self, scheduler):
+        if np is None:
+            raise ImportError("vectorized expansion needs numpy")
+        num_colons = len(scheduler.matrix_time[0]) if scheduler.matrix_time else 0
+        rows = [[scheduler.setup[b]] + list(scheduler.matrix_time[b]) for (b, _, _) in scheduler.job_classes]
+        self.boarding = np.array(rows, dtype=float).reshape(len(rows), num_colons + 1)
+        self.travel = np.array([travel for (_, _, travel) in scheduler.job_classes], dtype=float)
+        self.lb_service = np.array(scheduler.class_lb_service, dtype=float)
+
+
+def load_bound(new_g, new_total, new_work, open_ships: int, finishing: bool):
+    # Scheduler.heuristic's load-balancing LB_final for a batch of children;
+    # a child serving the last task gets LB_final = g, i.e. h = 0
+    if finishing:
+        return new_g
+    return np.maximum(new_g, np.ceil((new_total + new_work) / open_ships))
+
+
+def boarding_batch(table: ServiceTable, classes: List[int], ships: List[int], times: Tuple[float, ...],
+                   prev_cols: Tuple[int, ...], g: float, total_time: float, remaining_work: float):
+    # the children of one expansion, one row per class and one column per
+    # ship, timed boarding first like expand_ships: (boarding, arrival, new g,
+    # new total_time, new remaining_work)
+    k = np.array(classes)
+    s = np.array(ships)
+    start = np.array(times)[s][None, :]
+    boarding = start + table.boarding[k[:, None], (np.array(prev_cols)[s] + 1)[None, :]]
+    arrival = boarding + table.travel[k][:, None]
+    new_work = (remaining_work - table.lb_service[k])[:, None]
+    return boarding, arrival, np.maximum(g, arrival), total_time + (arrival - start), new_work
+
+
+def within(f, incumbent: float) -> Tuple[List[int], List[int]]:
+    # (row, column) indices of the children with f <= incumbent, row by row
+    # like the scalar loops
+    rows, cols = np.nonzero(f <= incumbent)
+    return rows.tolist(), cols.tolist()